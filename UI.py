@@ -7,6 +7,11 @@ from datetime import datetime, timedelta
 from dateutil import parser
 from echo.engine.echo_engine import EchoEngine
 from echo.engine.reports import format_daily
+from echo.engine.shared import get_engine, get_history, get_verdict
+from echo.engine.panels import rr_band, stale_tickers, position_table
+from echo.engine.portfolio import Portfolio, risk_checks
+from echo.data_providers.base import fetch_quotes
+from echo.engine import risk_metrics
 import hashlib
 import time
 
@@ -219,8 +224,8 @@ def show_overview():
     # Load data
     try:
         cfg_path = "echo/config.yaml"
-        eng = EchoEngine(cfg_path)
-        verdict = eng.run()
+        eng = get_engine(cfg_path)
+        verdict = get_verdict(cfg_path)
         cfg = eng.config
         provider = eng.provider
         slots = eng.slots
@@ -371,17 +376,37 @@ def show_portfolio():
         return
 
     verdict = st.session_state.verdict
+    cfg = st.session_state.cfg
     slots = st.session_state.slots
 
-    # Current positions
+    # Current positions, marked with one bulk quote call
     st.subheader("📊 Current Positions")
+    book = Portfolio.from_config(cfg)
+    try:
+        marks = book.mark(fetch_quotes(st.session_state.provider, book.tickers))
+    except Exception as e:
+        st.error(f"Could not fetch quotes: {e}")
+        return
 
-    for slot_name, ticker in slots.items():
-        with st.expander(f"📈 {slot_name}: {ticker}", expanded=True):
-            st.metric(f"{slot_name} Allocation", verdict.allocations.get(slot_name, 'N/A'))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Account Value", f"${marks.account_value.sum():,.2f}")
+    col2.metric("Unrealized P&L", f"${marks.account_pnl.sum():,.2f}")
+    col3.metric("Cash", f"${book.cash_usd:,.2f}")
 
-            # Add some basic position info
-            st.info(f"Current position: {ticker} in {slot_name} slot")
+    st.dataframe(position_table(book, marks).round(2), use_container_width=True)
+
+    exposure, cash = risk_checks(book, marks, cfg)
+    st.subheader("🛡️ Slot Exposure")
+    st.dataframe(exposure.round(2), use_container_width=True)
+    st.subheader("💵 Cash Buffer")
+    st.dataframe(cash.round(2), use_container_width=True)
+    for row in exposure[exposure["breach"]].itertuples():
+        st.warning(f"{row.account}/{row.slot}: ${row.risk_usd:,.2f} at risk exceeds the ${row.limit_usd:,.0f} slot limit")
+    for row in cash[cash["breach"]].itertuples():
+        st.warning(f"{row.account}: cash {row.cash_pct:.1f}% is below the {row.min_pct:.0f}% buffer")
+
+    for slot_name, ticker in slots.items():
+        st.metric(f"{slot_name} Allocation ({ticker})", verdict.allocations.get(slot_name, 'N/A'))
 
 def show_risk_analytics():
     """Risk analytics section"""
@@ -402,25 +427,15 @@ def show_risk_analytics():
     try:
         rr_cfg = cfg.get("rr_heatmap",{})
         rr_rows = []
+        slot_frames = provider.history_many(list(slots.values()), period="3mo", interval="1d")
+        metrics = risk_metrics.compute(risk_metrics.close_matrix(slot_frames))
 
         for label, tk in slots.items():
             try:
-                df = provider.history(tk, period="3mo", interval="1d")
-                if df is None or df.empty:
+                if tk not in metrics.index:
                     continue
-                ret = df["Close"].pct_change()
-                mom20 = (df["Close"].iloc[-1] / df["Close"].iloc[-21] - 1.0) if len(df) > 21 else np.nan
-                vol20 = ret.rolling(20).std().iloc[-1] * (252**0.5) if len(ret)>20 else np.nan
-                rr = (mom20*100) / (vol20*100) if (vol20 and vol20!=0 and not np.isnan(vol20)) else np.nan
-
-                color = "gray"
-                if rr == rr:
-                    if rr >= rr_cfg.get("green_min",1.5):
-                        color = "green"
-                    elif rr >= rr_cfg.get("yellow_min",1.0):
-                        color = "yellow"
-                    elif rr < rr_cfg.get("red_max",1.0):
-                        color = "red"
+                mom20, vol20, rr = metrics.loc[tk, ["momentum", "vol", "rr"]]
+                color = rr_band(rr, rr_cfg)
 
                 rr_rows.append({
                     "Slot": label.capitalize(),
@@ -443,6 +458,9 @@ def show_risk_analytics():
         if rr_rows:
             rr_df = pd.DataFrame(rr_rows)
             st.dataframe(rr_df, use_container_width=True)
+            stale = stale_tickers(slot_frames)
+            if stale:
+                st.caption(f"⚠️ Provider unavailable — last known prices for {', '.join(stale)}")
 
             # Risk summary
             high_risk = len([r for r in rr_rows if r["Risk Level"] == "Red"])
@@ -476,20 +494,25 @@ def show_historical():
     # Create tabs for each position
     tabs = st.tabs(list(slots.keys()))
 
+    try:
+        slot_frames = provider.history_many(list(slots.values()), period="3mo", interval="1d")
+    except Exception as e:
+        st.error(f"❌ Error loading price history: {str(e)}")
+        slot_frames = {}
+    metrics = risk_metrics.compute(risk_metrics.close_matrix(slot_frames))
+
     for i, (slot_name, ticker) in enumerate(slots.items()):
         with tabs[i]:
             try:
-                df = provider.history(ticker, period="3mo", interval="1d")
-                if df is not None and not df.empty:
-                    # Calculate returns
-                    df['Daily Return'] = df['Close'].pct_change()
-                    df['Cumulative Return'] = (1 + df['Daily Return']).cumprod() - 1
+                df = slot_frames.get(ticker)
+                if df is not None and not df.empty and ticker in metrics.index:
+                    m = metrics.loc[ticker]
 
                     col1, col2 = st.columns(2)
 
                     with col1:
-                        st.metric(f"{ticker} Current Price", f"${df['Close'].iloc[-1]:.2f}")
-                        st.metric(f"{ticker} 3M Return", f"{df['Cumulative Return'].iloc[-1]*100:.1f}%")
+                        st.metric(f"{ticker} Current Price", f"${m['last']:.2f}")
+                        st.metric(f"{ticker} 3M Return", f"{m['total_return']*100:.1f}%")
 
                     with col2:
                         # Simple price chart
@@ -500,16 +523,13 @@ def show_historical():
                     stats_col1, stats_col2, stats_col3 = st.columns(3)
 
                     with stats_col1:
-                        volatility = df['Daily Return'].std() * np.sqrt(252) * 100
-                        st.metric("Annual Volatility", f"{volatility:.1f}%")
+                        st.metric("Annual Volatility", f"{m['ann_vol']*100:.1f}%")
 
                     with stats_col2:
-                        sharpe = (df['Daily Return'].mean() * 252) / (df['Daily Return'].std() * np.sqrt(252))
-                        st.metric("Sharpe Ratio", f"{sharpe:.2f}")
+                        st.metric("Sharpe Ratio", f"{m['sharpe']:.2f}")
 
                     with stats_col3:
-                        max_drawdown = ((df['Close'] - df['Close'].expanding().max()) / df['Close'].expanding().max()).min() * 100
-                        st.metric("Max Drawdown", f"{max_drawdown:.1f}%")
+                        st.metric("Max Drawdown", f"{m['max_drawdown']*100:.1f}%")
 
                 else:
                     st.warning(f"⚠️ No data available for {ticker}")
@@ -517,6 +537,41 @@ def show_historical():
             except Exception as e:
                 st.error(f"❌ Error loading data for {ticker}: {str(e)}")
 
+    show_signal_history()
+
+def show_signal_history(cfg_path: str = "echo/config.yaml"):
+    """Composite conviction and per-signal scores from the verdict history store"""
+    st.subheader("🧭 Signal History")
+    store = get_history(cfg_path)
+    if store is None:
+        st.info("ℹ️ Verdict history is off. Set `history.enabled: true` in config.yaml.")
+        return
+
+    windows = {"1 day": 1, "1 week": 7, "1 month": 30, "3 months": 90, "1 year": 365}
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        window = st.selectbox("Window", list(windows.keys()), index=1)
+    names = store.signal_names()
+    with col2:
+        selected = st.multiselect("Signals", names, default=names)
+
+    start = time.time() - windows[window] * 86400
+    tz = st.session_state.cfg.get("timezone", "America/Chicago") if 'cfg' in st.session_state else "UTC"
+    verdicts = store.verdict_history(start=start)
+    if verdicts.empty:
+        st.warning("⚠️ No verdicts recorded in this window yet.")
+        return
+    verdicts.index = verdicts.index.tz_convert(tz)
+    st.markdown("**Composite Conviction**")
+    st.line_chart(verdicts["composite"])
+
+    if selected:
+        signals = store.signal_history(selected, start=start)
+        if not signals.empty:
+            signals.index = signals.index.tz_convert(tz)
+            st.markdown("**Signal Scores**")
+            st.line_chart(signals)
+
 def show_settings():
     """Settings and configuration"""
     st.header("⚙️ Settings & Configuration")
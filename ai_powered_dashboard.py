@@ -21,6 +21,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from echo.engine.echo_engine import EchoEngine
     from echo.engine.reports import format_daily
+    from echo.engine.shared import get_engine, get_verdict
     ECHO_ENGINE_AVAILABLE = True
 except ImportError:
     ECHO_ENGINE_AVAILABLE = False
@@ -365,8 +366,8 @@ def show_ai_overview():
             st.error("❌ Echo Engine not available")
             return
 
-        eng = EchoEngine(cfg_path)
-        verdict = eng.run()
+        eng = get_engine(cfg_path)
+        verdict = get_verdict(cfg_path)
 
         # Initialize AI Engine
         ai_engine = AITradingEngine()
@@ -486,8 +487,8 @@ def show_neural_signals():
 
     try:
         cfg_path = "echo/config.yaml"
-        eng = EchoEngine(cfg_path)
-        verdict = eng.run()
+        eng = get_engine(cfg_path)
+        verdict = get_verdict(cfg_path)
 
         ai_engine = AITradingEngine()
 
@@ -546,8 +547,8 @@ def show_ai_recommendations():
 
     try:
         cfg_path = "echo/config.yaml"
-        eng = EchoEngine(cfg_path)
-        verdict = eng.run()
+        eng = get_engine(cfg_path)
+        verdict = get_verdict(cfg_path)
 
         ai_engine = AITradingEngine()
         sentiment = ai_engine.analyze_market_sentiment(verdict.signals)
@@ -604,8 +605,8 @@ def show_risk_intelligence():
             st.error("❌ Echo Engine not available")
             return
 
-        eng = EchoEngine(cfg_path)
-        verdict = eng.run()
+        eng = get_engine(cfg_path)
+        verdict = get_verdict(cfg_path)
         cfg = eng.config
         provider = eng.provider
         slots = eng.slots
@@ -672,8 +673,8 @@ def show_predictive_analytics():
             st.error("❌ Echo Engine not available")
             return
 
-        eng = EchoEngine(cfg_path)
-        verdict = eng.run()
+        eng = get_engine(cfg_path)
+        verdict = get_verdict(cfg_path)
 
         ai_engine = AITradingEngine()
         prediction = ai_engine.predict_market_direction({"signals": verdict.signals})
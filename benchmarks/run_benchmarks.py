@@ -0,0 +1,124 @@
+"""Offline benchmark suite for the engine, rules, report formatting and panel math.
+
+Uses the deterministic SyntheticProvider, so it needs no network and no yfinance:
+
+    python -m benchmarks.run_benchmarks                      # writes benchmarks/results/<git sha>.json
+    python -m benchmarks.run_benchmarks --compare old.json new.json
+"""
+from __future__ import annotations
+import argparse, json, os, platform, statistics, subprocess, sys, tempfile, time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+import yaml
+
+from echo.engine.echo_engine import EchoEngine, _rule_label
+from echo.engine.reports import format_daily
+from echo.engine import panels
+from echo.data_providers.synthetic_provider import SyntheticProvider
+from echo.utils.dates import now_tz
+
+TICKER_COUNTS = (3, 30, 300)
+PERIODS = ("3mo", "1y", "5y")
+
+def timeit(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return {"median_s": statistics.median(runs), "min_s": min(runs), "runs": repeat}
+
+def bench_config(base_path: str, **engine_overrides) -> str:
+    """Temp copy of the config pointed at the synthetic provider, with signal reuse and history off so every run
+    does the work and nothing is written. The caller removes the file."""
+    with open(base_path, "r") as f:
+        cfg = yaml.safe_load(f)
+    cfg.setdefault("providers", {})["price_data"] = {"name": "synthetic"}
+    cfg.setdefault("engine", {}).update({"incremental": False, **engine_overrides})
+    cfg.setdefault("history", {})["enabled"] = False
+    fd, path = tempfile.mkstemp(suffix=".yaml", prefix="echo_bench_")
+    with os.fdopen(fd, "w") as f:
+        yaml.safe_dump(cfg, f, sort_keys=False)  # rule order = signal order
+    return path
+
+def bench_engine(base_path: str, **engine_overrides) -> EchoEngine:
+    path = bench_config(base_path, **engine_overrides)
+    try:
+        return EchoEngine(path)
+    finally:
+        os.remove(path)
+
+def tickers(n: int) -> List[str]:
+    return [f"SYN{i:04d}" for i in range(n)]
+
+def run_suite(config_path: str, repeat: int) -> List[Dict]:
+    results: List[Dict] = []
+
+    def record(name: str, fn: Callable[[], object], **params):
+        results.append({"name": name, "params": params, **timeit(fn, repeat)})
+        r = results[-1]
+        print(f"{name:<28} {json.dumps(params):<40} median {r['median_s']*1e3:9.3f} ms")
+
+    for mode in ("sequential", "parallel"):
+        eng = bench_engine(config_path, execution=mode)
+        record("engine.run", eng.run, execution=mode)
+
+    eng = bench_engine(config_path, execution="sequential")
+    context = eng._context(now_tz(eng.tz))
+    for rule in eng.rules:
+        record("rule.run", lambda r=rule: r.run(context), rule=_rule_label(rule))
+
+    verdict = eng.run()
+    record("reports.format_daily", lambda: format_daily(verdict))
+
+    provider = SyntheticProvider()
+    rr_cfg = eng.config.get("rr_heatmap", {})
+    for n in TICKER_COUNTS:
+        for period in PERIODS:
+            frames = provider.history_many(tickers(n), period=period)
+            slots = {t.lower(): t for t in frames}
+            record("panels.rr_rows", lambda: panels.rr_rows(slots, frames, rr_cfg), tickers=n, period=period)
+            record("panels.sector_flow_rows", lambda: panels.sector_flow_rows(slots, frames), tickers=n, period=period)
+    return results
+
+def git_sha() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+def compare(old_path: str, new_path: str):
+    with open(old_path) as f:
+        old = {(r["name"], json.dumps(r["params"], sort_keys=True)): r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+    for r in new:
+        key = (r["name"], json.dumps(r["params"], sort_keys=True))
+        if key in old:
+            ratio = r["median_s"] / old[key]["median_s"] if old[key]["median_s"] else float("nan")
+            print(f"{r['name']:<28} {key[1]:<40} {old[key]['median_s']*1e3:9.3f} → {r['median_s']*1e3:9.3f} ms  ({ratio:.2f}x)")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default="echo/config.yaml")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--out", help="result JSON path (default benchmarks/results/<git sha>.json)")
+    ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files and exit")
+    args = ap.parse_args()
+    if args.compare:
+        return compare(*args.compare)
+
+    results = run_suite(args.config, args.repeat)
+    sha = git_sha()
+    out = args.out or os.path.join("benchmarks", "results", f"{sha}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"meta": {"commit": sha, "python": sys.version.split()[0], "platform": platform.platform(),
+                            "timestamp": datetime.now(timezone.utc).isoformat(), "repeat": args.repeat},
+                   "results": results}, f, indent=2)
+    print(f"\nResults written: {out}")
+
+if __name__ == "__main__":
+    main()
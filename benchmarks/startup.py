@@ -0,0 +1,76 @@
+"""Cold-start benchmark: wall time of fresh interpreters importing Echo and producing the daily report.
+
+Each scenario runs in a new `python` process (so nothing is already imported) and also reports which heavy
+optional modules it ended up loading:
+
+    python -m benchmarks.startup                   # writes benchmarks/results/startup-<git sha>.json
+    python -m benchmarks.run_benchmarks --compare old.json new.json
+"""
+from __future__ import annotations
+import argparse, json, os, platform, statistics, subprocess, sys, time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from benchmarks.run_benchmarks import bench_config, git_sha
+
+HEAVY = ("pandas", "yfinance", "aiohttp", "pyarrow", "plotly", "streamlit")
+
+SCENARIOS = {
+    "import echo": "import echo",
+    "import echo.main": "import echo.main",
+    "engine init": "from echo import EchoEngine\nEchoEngine(CFG)",
+    "daily report": "from echo import EchoEngine\nfrom echo.engine.reports import format_daily\n"
+                    "format_daily(EchoEngine(CFG).run())",
+    "daily report (calendar rules)": "from echo import EchoEngine\nfrom echo.engine.reports import format_daily\n"
+                                     "from echo.rules.registry import build_rules\neng = EchoEngine(CFG)\n"
+                                     "eng.rules = build_rules([('fomc_tilt', {}), ('turn_of_month', {}), "
+                                     "('pead', {'slot_key': 'momentum'}), ('loan_accelerator', {})])\n"
+                                     "format_daily(eng.run())",
+}
+
+def run_once(code: str, cfg_path: str) -> Dict:
+    probe = f"\nimport sys, json\nprint(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", f"CFG = {cfg_path!r}\n{code}{probe}"], capture_output=True, text=True,
+                         check=True)
+    elapsed = time.perf_counter() - t0
+    return {"seconds": elapsed, "modules": json.loads(out.stdout.strip().splitlines()[-1])}
+
+def run_suite(config_path: str, repeat: int) -> List[Dict]:
+    cfg_path = bench_config(config_path)
+    results = []
+    try:
+        run_once("pass", cfg_path)  # warm the OS file cache and .pyc files
+        baseline = statistics.median(run_once("pass", cfg_path)["seconds"] for _ in range(repeat))
+        print(f"{'python -c pass':<32} median {baseline*1e3:8.1f} ms")
+        for name, code in SCENARIOS.items():
+            runs = [run_once(code, cfg_path) for _ in range(repeat)]
+            secs = [r["seconds"] for r in runs]
+            results.append({"name": "startup", "params": {"scenario": name}, "median_s": statistics.median(secs),
+                            "min_s": min(secs), "runs": repeat, "over_interpreter_s": statistics.median(secs) - baseline,
+                            "modules": runs[-1]["modules"]})
+            r = results[-1]
+            print(f"{name:<32} median {r['median_s']*1e3:8.1f} ms  (+{r['over_interpreter_s']*1e3:7.1f} ms)  "
+                  f"loads: {', '.join(r['modules']) or '-'}")
+    finally:
+        os.remove(cfg_path)
+    return results
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default="echo/config.yaml")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="result JSON path (default benchmarks/results/startup-<git sha>.json)")
+    args = ap.parse_args()
+    results = run_suite(args.config, args.repeat)
+    sha = git_sha()
+    out = args.out or os.path.join("benchmarks", "results", f"startup-{sha}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"meta": {"commit": sha, "python": sys.version.split()[0], "platform": platform.platform(),
+                            "timestamp": datetime.now(timezone.utc).isoformat(), "repeat": args.repeat},
+                   "results": results}, f, indent=2)
+    print(f"\nResults written: {out}")
+
+if __name__ == "__main__":
+    main()
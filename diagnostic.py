@@ -15,6 +15,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from echo.engine.echo_engine import EchoEngine
     from echo.engine.reports import format_daily
+    from echo.engine.shared import get_engine, get_verdict, run_engine
+    from echo.utils.timing import Tracer, breakdown, to_json, tracing
     IMPORT_SUCCESS = True
 except ImportError as e:
     st.error(f"❌ Import Error: {e}")
@@ -22,6 +24,7 @@ except ImportError as e:
     IMPORT_SUCCESS = False
     EchoEngine = None
     format_daily = None
+    get_engine = get_verdict = run_engine = None
 
 # ==================== SIMPLE DIAGNOSTIC MODE ====================
 def diagnostic_mode():
@@ -44,8 +47,8 @@ def diagnostic_mode():
         if os.path.exists(cfg_path):
             st.success("✅ Config file found")
             if EchoEngine is not None:
-                eng = EchoEngine(cfg_path)
-                verdict = eng.run()
+                eng = get_engine(cfg_path)
+                verdict = get_verdict(cfg_path)
                 st.success("✅ Engine execution successful")
 
                 # Show basic metrics
@@ -65,6 +68,49 @@ def diagnostic_mode():
         st.error(f"❌ Engine execution failed: {str(e)}")
         st.info("This might be due to missing dependencies or configuration issues")
 
+# ==================== TIMING BREAKDOWN ====================
+def timing_mode():
+    """Traced engine run: where the time goes (config, rules, provider calls, cache, report)"""
+    st.title("⏱️ Echo AI - Timing Breakdown")
+
+    if not IMPORT_SUCCESS:
+        st.error("❌ Echo Engine import failed")
+        return
+
+    try:
+        cfg_path = "echo/config.yaml"
+        verdict = run_engine(cfg_path, trace=True)  # under the shared engine's lock, like dashboard refreshes
+        with tracing(Tracer(list(verdict.trace))) as tracer:  # the report span goes on a copy
+            format_daily(verdict)
+        spans = tracer.spans
+
+        total_ms = sum(s["duration_s"] for s in spans if s["name"] == "engine.run") * 1000
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Engine run", f"{total_ms:.1f} ms")
+        col2.metric("Spans", len(spans))
+        col3.metric("Rules reused", len(verdict.reused))
+
+        st.subheader("📊 Breakdown by span")
+        bdf = pd.DataFrame(breakdown(spans))
+        if not bdf.empty:
+            bdf["total_ms"] = (bdf.pop("total_s") * 1000).round(3)
+            bdf["max_ms"] = (bdf.pop("max_s") * 1000).round(3)
+            st.dataframe(bdf, use_container_width=True)
+            st.bar_chart(bdf.set_index("name")["total_ms"])
+
+        st.subheader("📋 Per-rule wall time")
+        rdf = pd.DataFrame([{"Rule": k, "ms": round(v * 1000, 3)} for k, v in verdict.timings.items()])
+        if not rdf.empty:
+            st.dataframe(rdf.sort_values("ms", ascending=False), use_container_width=True)
+        if verdict.reused:
+            st.caption(f"Reused from previous run (inputs unchanged): {', '.join(verdict.reused)}")
+
+        st.download_button("⬇️ Download trace JSON", to_json(spans),
+                           file_name="echo_trace.json", mime="application/json")
+
+    except Exception as e:
+        st.error(f"❌ Traced run failed: {str(e)}")
+
 # ==================== MAIN APP ====================
 def main():
     st.set_page_config(
@@ -79,13 +125,15 @@ def main():
     # Sidebar for navigation
     with st.sidebar:
         st.title("🔧 Diagnostic Tools")
-        mode = st.selectbox("Mode", ["Diagnostic", "Full Dashboard"])
+        mode = st.selectbox("Mode", ["Diagnostic", "Timing Breakdown", "Full Dashboard"])
 
         if st.button("🔄 Refresh"):
             st.rerun()
 
     if mode == "Diagnostic":
         diagnostic_mode()
+    elif mode == "Timing Breakdown":
+        timing_mode()
     else:
         st.info("Switch to Diagnostic mode first to test basic functionality")
 
@@ -1 +1,9 @@
-from .engine.echo_engine import EchoEngine
+# EchoEngine is resolved on first access so `import echo` (and e.g. `python -m echo.main --help`)
+# doesn't pay for the engine's imports.
+__all__ = ["EchoEngine"]
+
+def __getattr__(name):
+    if name == "EchoEngine":
+        from .engine.echo_engine import EchoEngine
+        return EchoEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
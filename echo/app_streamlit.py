@@ -4,9 +4,10 @@ import streamlit as st
 from streamlit_autorefresh import st_autorefresh
 import pandas as pd
 from datetime import datetime, timedelta
-from dateutil import parser
 from engine.echo_engine import EchoEngine
 from engine.reports import format_daily
+from engine.shared import get_engine, get_verdict
+from engine import panels
 
 # Auto-refresh dashboard every 5 seconds
 st_autorefresh(interval=5000)
@@ -16,8 +17,8 @@ st.title("Echo v62 — Local Runner (PLUS)")
 st.caption("Local, privacy-first dashboard. Research & decision support only — no trading automation.")
 
 cfg_path = "echo/config.yaml"
-eng = EchoEngine(cfg_path)
-verdict = eng.run()
+eng = get_engine(cfg_path)
+verdict = get_verdict(cfg_path)
 cfg = eng.config
 provider = eng.provider
 slots = eng.slots
@@ -79,18 +80,7 @@ else:
 # 2) Catalyst Countdown
 # cSpell:ignore fomc FOMC etfs
 st.subheader("Catalyst Countdown")
-cal = cfg.get("calendar", {})
-countdown_rows = []
-# HOW DO I D
-for d in cal.get("fomc_dates", []):
-    dd = parser.parse(d)
-    days = (dd.date() - datetime.now().date()).days
-    countdown_rows.append({"Event":"FOMC", "Date": dd.date().isoformat(), "Days": days})
-# Earnings
-for tk, ds in cal.get("earnings", {}).items():
-    dd = parser.parse(ds)
-    days = (dd.date() - datetime.now().date()).days
-    countdown_rows.append({"Event": f"Earnings:{tk}", "Date": dd.date().isoformat(), "Days": days})
+countdown_rows = eng.calendar.upcoming(now)
 if countdown_rows:
     cdf = pd.DataFrame(countdown_rows).sort_values("Days")
     st.dataframe(cdf, use_container_width=True)
@@ -99,56 +89,36 @@ else:
 
 # 3) Risk/Reward Heatmap (simple proxy: 20d momentum vs 20d volatility on slots)
 st.subheader("Risk/Reward Heatmap")
-import numpy as np
 rr_cfg = cfg.get("rr_heatmap",{})
-rr_rows = []
-for label, tk in slots.items():
-    try:
-        df = provider.history(tk, period="3mo", interval="1d")
-        if df is None or df.empty: 
-            continue
-        ret = df["Close"].pct_change()
-        mom20 = (df["Close"].iloc[-1] / df["Close"].iloc[-21] - 1.0) if len(df) > 21 else np.nan
-        vol20 = ret.rolling(20).std().iloc[-1] * (252**0.5) if len(ret)>20 else np.nan
-        rr = (mom20*100) / (vol20*100) if (vol20 and vol20!=0 and not np.isnan(vol20)) else np.nan
-        # Color band logic
-        color = "gray"
-        if rr == rr:
-            if rr >= rr_cfg.get("green_min",1.5):
-                color = "green"
-            elif rr >= rr_cfg.get("yellow_min",1.0):
-                color = "yellow"
-            elif rr < rr_cfg.get("red_max",1.0):
-                color = "red"
-        rr_rows.append({"Slot": label.capitalize(), "Ticker": tk, "Momentum(20d)%": round(mom20*100,2) if mom20==mom20 else None, 
-                        "Vol(ann%)": round(vol20*100,1) if vol20==vol20 else None, "R:R": round(rr,2) if rr==rr else None,
-                        "Band": color,
-                        "Suggested Stop": f"{rr_cfg.get('stop_pct',5)}%",
-                        "Suggested Target": f"{rr_cfg.get('target_pct',10)}%"})
-    except Exception as e:
-        rr_rows.append({"Slot": label.capitalize(), "Ticker": tk, "Momentum(20d)%": None, "Vol(ann%)": None, "R:R": None, "Band": "gray", "Suggested Stop": None, "Suggested Target": None})
+try:
+    online = panels.rr_online(eng.stats)
+    if online is not None and online.covers(slots.values(), panels.RR_WINDOW):
+        slot_frames = {}  # online stats already hold every slot's R:R
+    else:
+        slot_frames = provider.history_many(list(slots.values()), period="3mo", interval="1d")
+except Exception:
+    slot_frames = {}
+rr_rows = panels.rr_rows(slots, slot_frames, rr_cfg, online=eng.stats)
 if rr_rows:
     rr_df = pd.DataFrame(rr_rows)
     st.dataframe(rr_df, use_container_width=True)
+    stale = panels.stale_tickers(slot_frames)
+    if stale:
+        st.caption(f"⚠️ Provider unavailable — last known prices for {', '.join(stale)}")
     st.caption(f"Thresholds: green ≥ {rr_cfg.get('green_min',1.5)}, yellow ≥ {rr_cfg.get('yellow_min',1.0)}, red < {rr_cfg.get('red_max',1.0)} | Stop: {rr_cfg.get('stop_pct',5)}%, Target: {rr_cfg.get('target_pct',10)}%")
 else:
     st.info("No data available for R:R right now.")
 
 # 4) Sector Flow Scanner (5d returns on sector ETFs from config)
 st.subheader("Sector Flow Scanner (5d Change)")
-flows = []
-for name, etf in cfg.get("sector_etfs", {}).items():
-    try:
-        df = provider.history(etf, period="2mo", interval="1d")
-        if df is None or df.empty or len(df)<6:
-            continue
-        c = df["Close"]
-        chg5 = (c.iloc[-1]/c.iloc[-6]-1.0)*100
-        flows.append({"Sector": name, "ETF": etf, "5d %": round(float(chg5),2)})
-    except Exception:
-        pass
+sector_etfs = cfg.get("sector_etfs", {})
+try:
+    etf_frames = provider.history_many(list(sector_etfs.values()), period="2mo", interval="1d")
+except Exception:
+    etf_frames = {}
+flows = panels.sector_flow_rows(sector_etfs, etf_frames)
 if flows:
-    flows_df = pd.DataFrame(flows).sort_values("5d %", ascending=False)
+    flows_df = pd.DataFrame(flows)
     st.dataframe(flows_df, use_container_width=True)
 else:
     st.info("No sector flow data available.")
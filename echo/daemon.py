@@ -0,0 +1,57 @@
+from __future__ import annotations
+import argparse, signal, threading, time
+from .engine.echo_engine import EchoEngine
+from .engine.history import VerdictStore
+from .engine.scheduler import next_interval
+from .engine.shared import config_key
+from .engine.snapshots import save_snapshot
+from .data_providers.stream import start_stream
+from .utils.dates import now_tz
+from .utils.logging import get_logger
+
+log = get_logger("EchoDaemon")
+
+def run(config_path: str, once: bool = False):
+    """Resident loop: compute a verdict, persist the snapshot, sleep on the market-aware cadence.
+
+    The config is re-read whenever its content hash changes, so edits apply without a restart.
+    """
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    key, eng, store, stream = None, None, None, None
+    while not stop.is_set():
+        try:
+            new_key = config_key(config_path)
+            if new_key != key:
+                if stream is not None:
+                    stream.close()
+                key, eng = new_key, EchoEngine(config_path)
+                store = VerdictStore.from_config(eng.config)
+                stream = start_stream(eng) if not once else None
+                log.info(f"Loaded config {config_path} ({key[:8]})")
+            sched = eng.config.get("scheduler", {})
+            path = sched.get("snapshot_path", "reports/verdict_latest.json")
+            t0 = time.time()
+            verdict = eng.run()
+            save_snapshot(verdict, path, computed_at=t0)
+            if store is not None:
+                store.append(verdict, ts=t0)
+            log.info(f"Verdict {verdict.composite:.0f}/100 {verdict.risk_label} → {path} ({time.time() - t0:.2f}s)")
+            wait_s = next_interval(now_tz(eng.tz), sched)
+        except Exception as e:
+            log.exception(f"Verdict cycle failed: {e}")
+            wait_s = 60.0
+        if once:
+            break
+        stop.wait(wait_s)
+
+def main():
+    ap = argparse.ArgumentParser(description="Precompute Echo verdicts on a market-aware cadence.")
+    ap.add_argument("--config", default="echo/config.yaml")
+    ap.add_argument("--once", action="store_true", help="compute one snapshot and exit")
+    args = ap.parse_args()
+    run(args.config, once=args.once)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,61 @@
-from typing import Protocol, Dict
+import threading
+from typing import Protocol, Dict, Iterable
 import pandas as pd
 class PriceProvider(Protocol):
     def quote(self, ticker: str) -> Dict: ...
     def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame: ...
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]: ...
+    def quotes(self, tickers: Iterable[str]) -> Dict[str, Dict]: ...
+
+class AsyncPriceProvider(Protocol):
+    async def quote(self, ticker: str) -> Dict: ...
+    async def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame: ...
+    async def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]: ...
+    async def close(self) -> None: ...
+
+def fetch_many(provider, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+    """Batched history via `provider.history_many`, falling back to one `history` call per ticker."""
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    if hasattr(provider, "history_many"):
+        return provider.history_many(tickers, period=period, interval=interval)
+    return {t: provider.history(t, period=period, interval=interval) for t in tickers}
+
+def fetch_quotes(provider, tickers: Iterable[str]) -> Dict[str, Dict]:
+    """Bulk quotes via `provider.quotes`, falling back to one `quote` call per ticker."""
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    if hasattr(provider, "quotes"):
+        return provider.quotes(tickers)
+    return {t: provider.quote(t) for t in tickers}
+
+def provider_host(provider) -> str:
+    """Upstream host behind a chain of wrappers (each exposing `.inner`), for shared per-host state."""
+    while getattr(provider, "host", None) is None and getattr(provider, "inner", None) is not None:
+        provider = provider.inner
+    return getattr(provider, "host", None) or type(provider).__name__
+
+_currencies: Dict[tuple, str] = {}
+_currencies_lock = threading.Lock()
+
+def quote_currency(provider, ticker: str) -> str:
+    """Trading currency of `ticker` from the first provider down the wrapper chain (`.inner` / `.upstream`) with a
+    `currency(ticker)` method, memoized per process; "USD" when none knows it (synthetic, offline store)."""
+    p = provider
+    while p is not None and not hasattr(p, "currency"):
+        p = getattr(p, "inner", None) or getattr(p, "upstream", None)
+    if p is None:
+        return "USD"
+    key = (type(p).__name__, ticker)
+    with _currencies_lock:
+        cur = _currencies.get(key)
+    if cur is None:
+        try:
+            cur = p.currency(ticker) or "USD"
+        except Exception:
+            return "USD"  # not memoized; asked again next time
+        with _currencies_lock:
+            _currencies[key] = cur
+    return cur
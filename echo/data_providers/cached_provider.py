@@ -0,0 +1,195 @@
+from __future__ import annotations
+import os, re, time, pickle, threading
+from contextlib import suppress
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+from .base import PriceProvider, fetch_many, fetch_quotes
+from ..utils.concurrency import SingleFlight
+from ..utils.dates import period_start, covering_period
+from ..utils.logging import get_logger
+from ..utils.timing import span
+
+log = get_logger("CachedProvider")
+
+def _utc(ts: pd.Timestamp) -> pd.Timestamp:
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+def _match_tz(index: pd.DatetimeIndex, tz) -> pd.DatetimeIndex:
+    """`index` in the cached bars' representation: converted to `tz`, or wall times when the cache is tz-naive."""
+    if tz is None:
+        return index.tz_localize(None) if index.tz is not None else index
+    return index.tz_localize(tz) if index.tz is None else index.tz_convert(tz)
+
+class CachedProvider:
+    """On-disk OHLCV cache in front of another PriceProvider.
+
+    Bars are stored per ticker/interval. A request is served from disk when the stored
+    window covers the requested period and was refreshed within `ttl_seconds`; a stale
+    entry only fetches the missing tail, and is served as is (`df.attrs["stale"]`) if that
+    fetch fails. Files are evicted by age and, least recently used first, by total size.
+    """
+    def __init__(self, inner: PriceProvider, cache_dir: str = ".echo_cache", ttl_seconds: float = 300,
+                 max_bytes: int = 256 * 1024 * 1024, max_age_days: float = 30):
+        self.inner = inner
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self._lock = threading.RLock()
+        self._flight = SingleFlight()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, inner: PriceProvider, cache_cfg: Dict) -> "CachedProvider":
+        return cls(inner, cache_dir=cache_cfg.get("dir", ".echo_cache"),
+                   ttl_seconds=cache_cfg.get("ttl_seconds", 300),
+                   max_bytes=int(cache_cfg.get("max_mb", 256) * 1024 * 1024),
+                   max_age_days=cache_cfg.get("max_age_days", 30))
+
+    def quote(self, ticker: str) -> Dict:
+        return self.inner.quote(ticker)
+
+    def quotes(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        return fetch_quotes(self.inner, tickers)
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        return self.history_many([ticker], period=period, interval=interval)[ticker]
+
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(tickers))
+        now = pd.Timestamp.now(tz="UTC")
+        want = period_start(period, now)
+        # The lock only guards reading and writing cache files; upstream fetches (with their retries) run
+        # outside it, and identical concurrent fetches are collapsed into one.
+        with span("cache.history_many", tickers=len(tickers), period=period, interval=interval) as sp:
+            with self._lock:
+                entries = {t: self._load(self._path(t, interval)) for t in tickers}
+            missing = [t for t, e in entries.items() if e is None or not self._covers(e["start"], want)]
+            stale = [t for t, e in entries.items() if t not in missing and time.time() - e["fetched_at"] > self.ttl_seconds]
+            sp.set(hits=len(tickers) - len(missing) - len(stale), misses=len(missing), stale=len(stale))
+            degraded = set()  # served but not cached: the refresh failed or came back stale itself
+            if missing:
+                fetched = self._fetch(missing, period, interval)
+                for t in missing:
+                    bars = fetched.get(t)
+                    entries[t] = None if bars is None or bars.empty else {"start": want, "fetched_at": time.time(), "bars": bars}
+                    if entries[t] is not None and bars.attrs.get("stale"):
+                        degraded.add(t)
+            if stale:
+                last = min(self._last_bar(entries[t], now) for t in stale)
+                try:
+                    tails = self._fetch(stale, covering_period(last, now), interval)
+                except Exception as e:
+                    log.warning(f"Refreshing {len(stale)} cached tickers failed, serving stale bars: {e}")
+                    tails = {}
+                    degraded.update(stale)
+                for t in stale:
+                    tail = tails.get(t)
+                    if tail is not None and tail.attrs.get("stale"):
+                        degraded.add(t)
+                    if t not in degraded:
+                        entries[t] = self._merge_tail(entries[t], tail)
+            with self._lock:
+                saved = False
+                for t, e in entries.items():
+                    if e is None or t in degraded:
+                        continue
+                    if t in missing or t in stale:
+                        self._save(self._path(t, interval), e)
+                        saved = True
+                    else:
+                        with suppress(FileNotFoundError):
+                            os.utime(self._path(t, interval))
+                if saved:
+                    self._evict()  # once per call: it lists and stats the whole cache dir
+        out = {t: self._slice(e, want) for t, e in entries.items()}
+        for t in degraded:
+            out[t].attrs["stale"] = True
+        return out
+
+    def _fetch(self, tickers: List[str], period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        def fetch():
+            if len(tickers) == 1:
+                return {tickers[0]: self.inner.history(tickers[0], period=period, interval=interval)}
+            return fetch_many(self.inner, tickers, period=period, interval=interval)
+        return self._flight.do((tuple(tickers), period, interval), fetch)[0]
+
+    @staticmethod
+    def _last_bar(entry: Dict, now: pd.Timestamp) -> pd.Timestamp:
+        bars = entry["bars"]
+        return _utc(bars.index[-1]) if not bars.empty else (entry["start"] or now)
+
+    @staticmethod
+    def _merge_tail(entry: Dict, tail: Optional[pd.DataFrame]) -> Dict:
+        bars = entry["bars"]
+        if tail is not None and not tail.empty:
+            tail = tail.copy()
+            tail.index = _match_tz(tail.index, bars.index.tz) if not bars.empty else tail.index
+            merged = pd.concat([bars, tail])
+            bars = merged[~merged.index.duplicated(keep="last")].sort_index()
+        return {"start": entry["start"], "fetched_at": time.time(), "bars": bars}
+
+    def _slice(self, entry: Optional[Dict], want: Optional[pd.Timestamp]) -> pd.DataFrame:
+        if entry is None:
+            return pd.DataFrame()
+        bars = entry["bars"]
+        if want is None or bars.empty:
+            return bars.copy()
+        return bars[bars.index >= self._align(want, bars.index)].copy()
+
+    @staticmethod
+    def _covers(start: Optional[pd.Timestamp], want: Optional[pd.Timestamp]) -> bool:
+        if start is None:
+            return True
+        return want is not None and start <= want
+
+    @staticmethod
+    def _align(ts: pd.Timestamp, index: pd.Index) -> pd.Timestamp:
+        tz = getattr(index, "tz", None)
+        return ts.tz_convert(tz) if tz is not None else ts.tz_convert("UTC").tz_localize(None)
+
+    def _path(self, ticker: str, interval: str) -> str:
+        key = re.sub(r"[^A-Za-z0-9._-]", "_", f"{ticker}_{interval}")
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _load(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(f"Dropping unreadable cache file {path}: {e}")
+            os.remove(path)
+            return None
+
+    def _save(self, path: str, entry: Dict):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def _evict(self):
+        now = time.time()
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            p = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(p)
+            except FileNotFoundError:
+                continue
+            if now - st.st_mtime > self.max_age_seconds:
+                with suppress(FileNotFoundError):
+                    os.remove(p)
+            else:
+                files.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            with suppress(FileNotFoundError):
+                os.remove(p)
+            total -= size
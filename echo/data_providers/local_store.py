@@ -0,0 +1,219 @@
+from __future__ import annotations
+import glob, json, os, re, threading, time
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+from .base import PriceProvider, fetch_many, quote_currency
+from ..utils.dates import period_start, covering_period
+from ..utils.logging import get_logger
+from ..utils.timing import span
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except Exception:
+    pa = None
+
+log = get_logger("LocalBarStore")
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+class LocalBarStore:
+    """Columnar bar store: one directory per interval/ticker holding Arrow IPC part files.
+
+    Appends write a new part; reads memory-map every part so float columns come back without
+    copying. Parts are compacted into one once there are more than `compact_after`.
+    """
+    def __init__(self, root: str = "data/bars", compact_after: int = 16):
+        if pa is None:
+            raise RuntimeError("pyarrow not installed. Run `pip install pyarrow`.")
+        self.root = root
+        self.compact_after = compact_after
+        self._lock = threading.RLock()
+
+    def _dir(self, ticker: str, interval: str) -> str:
+        return os.path.join(self.root, interval, re.sub(r"[^A-Za-z0-9._-]", "_", ticker))
+
+    def _parts(self, ticker: str, interval: str) -> List[str]:
+        return sorted(glob.glob(os.path.join(self._dir(ticker, interval), "part-*.arrow")))
+
+    def tickers(self, interval: str = "1d") -> List[str]:
+        base = os.path.join(self.root, interval)
+        return sorted(os.listdir(base)) if os.path.isdir(base) else []
+
+    def meta(self, ticker: str, interval: str) -> Dict:
+        try:
+            with open(os.path.join(self._dir(ticker, interval), "_meta.json"), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def set_meta(self, ticker: str, interval: str, **kw):
+        d = self._dir(ticker, interval)
+        os.makedirs(d, exist_ok=True)
+        meta = {**self.meta(ticker, interval), **kw}
+        tmp = os.path.join(d, f"_meta.json.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(d, "_meta.json"))
+
+    def last_timestamp(self, ticker: str, interval: str) -> Optional[pd.Timestamp]:
+        parts = self._parts(ticker, interval)
+        if not parts:
+            return None
+        table = self._read_part(parts[-1])
+        if table.num_rows == 0:
+            return None
+        return pd.Timestamp(table.column("timestamp")[-1].as_py()).tz_convert("UTC")
+
+    def read(self, ticker: str, interval: str = "1d", start: Optional[pd.Timestamp] = None,
+             end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        with self._lock:
+            parts = self._parts(ticker, interval)
+            if not parts:
+                return pd.DataFrame()
+            tables = [self._read_part(p) for p in parts]
+        table = tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+        df = table.to_pandas(split_blocks=True, self_destruct=False).set_index("timestamp")
+        if len(tables) > 1:
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+        tz = self.meta(ticker, interval).get("tz")
+        if tz:
+            df.index = df.index.tz_convert(tz)
+        df.index.name = "Date"
+        if start is not None:
+            df = df[df.index >= _as_index_tz(start, df.index)]
+        if end is not None:
+            df = df[df.index <= _as_index_tz(end, df.index)]
+        return df
+
+    def append(self, ticker: str, interval: str, bars: pd.DataFrame) -> int:
+        """Append bars at or after the last stored timestamp (a re-sent last bar replaces the stored one)."""
+        if bars is None or bars.empty:
+            return 0
+        with self._lock:
+            last = self.last_timestamp(ticker, interval)
+            new = _normalize(bars)
+            if last is not None:
+                new = new[new["timestamp"] >= last]
+            if new.empty:
+                return 0
+            parts = self._parts(ticker, interval)
+            n = int(os.path.basename(parts[-1])[5:11]) + 1 if parts else 0
+            self._write_part(ticker, interval, n, new, bars)
+            if len(parts) + 1 > self.compact_after:
+                self.compact(ticker, interval)
+            return len(new)
+
+    def write(self, ticker: str, interval: str, bars: pd.DataFrame):
+        """Merge `bars` with whatever is stored (new rows win) and rewrite the partition as one part."""
+        if bars is None or bars.empty:
+            return
+        with self._lock:
+            stored = self.read(ticker, interval)
+            if not stored.empty:
+                bars = bars.copy()
+                bars.index = _utc_index(bars.index).tz_convert(stored.index.tz)
+                bars = pd.concat([stored, bars])
+                bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+            self._replace(ticker, interval, bars)
+
+    def compact(self, ticker: str, interval: str):
+        with self._lock:
+            self._replace(ticker, interval, self.read(ticker, interval))
+
+    def _replace(self, ticker: str, interval: str, bars: pd.DataFrame):
+        old = self._parts(ticker, interval)
+        n = int(os.path.basename(old[-1])[5:11]) + 1 if old else 0
+        self._write_part(ticker, interval, n, _normalize(bars), bars)
+        for p in old:
+            os.remove(p)
+
+    def _write_part(self, ticker: str, interval: str, n: int, rows: pd.DataFrame, src: pd.DataFrame):
+        d = self._dir(ticker, interval)
+        os.makedirs(d, exist_ok=True)
+        if src.index.tz is not None and "tz" not in self.meta(ticker, interval):
+            self.set_meta(ticker, interval, tz=str(src.index.tz))
+        table = pa.Table.from_pandas(rows, preserve_index=False)
+        path = os.path.join(d, f"part-{n:06d}.arrow")
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_part(path: str) -> "pa.Table":
+        with pa.memory_map(path, "r") as source:
+            return pa.ipc.open_file(source).read_all()
+
+def _utc_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    return index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+
+def _normalize(bars: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame({"timestamp": _utc_index(pd.DatetimeIndex(bars.index))})
+    for c in BAR_COLUMNS:
+        out[c] = bars[c].astype("float64").values if c in bars else float("nan")
+    return out
+
+def _as_index_tz(ts: pd.Timestamp, index: pd.Index) -> pd.Timestamp:
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.tz_convert(index.tz)
+
+class LocalStoreProvider:
+    """PriceProvider over a LocalBarStore. With an `upstream` provider, missing history is backfilled and
+    new bars appended at most every `refresh_seconds`; without one it serves the store fully offline."""
+    def __init__(self, store: LocalBarStore, upstream: Optional[PriceProvider] = None, refresh_seconds: float = 300):
+        self.store = store
+        self.upstream = upstream
+        self.refresh_seconds = refresh_seconds
+        self._synced: Dict[tuple, float] = {}
+
+    def quote(self, ticker: str) -> Dict:
+        bars = self.store.read(ticker, "1d")
+        if bars.empty and self.upstream is not None:
+            return self.upstream.quote(ticker)
+        close = bars["Close"].dropna()
+        return {
+            "ticker": ticker,
+            "price": float(close.iloc[-1]) if len(close) else None,
+            "prev_close": float(close.iloc[-2]) if len(close) > 1 else None,
+            "currency": quote_currency(self, ticker),
+        }
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        return self.history_many([ticker], period=period, interval=interval)[ticker]
+
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(tickers))
+        want = period_start(period)
+        if self.upstream is not None:
+            with span("store.sync", tickers=len(tickers), period=period, interval=interval):
+                self._sync(tickers, period, want, interval)
+        with span("store.read", tickers=len(tickers), period=period, interval=interval):
+            return {t: self.store.read(t, interval, start=want) for t in tickers}
+
+    def _sync(self, tickers: List[str], period: str, want: Optional[pd.Timestamp], interval: str):
+        now = pd.Timestamp.now(tz="UTC")
+        backfill, tail = [], []
+        for t in tickers:
+            start = self.store.meta(t, interval).get("start", "missing")
+            covered = start is None or (start != "missing" and want is not None and pd.Timestamp(start) <= want)
+            if not covered:
+                backfill.append(t)
+            elif time.time() - self._synced.get((t, interval), 0) > self.refresh_seconds:
+                tail.append(t)
+        try:
+            if backfill:
+                for t, bars in fetch_many(self.upstream, backfill, period=period, interval=interval).items():
+                    if bars is not None and not bars.empty:
+                        self.store.write(t, interval, bars)
+                        self.store.set_meta(t, interval, start=want.isoformat() if want is not None else None)
+                        self._synced[(t, interval)] = time.time()
+            if tail:
+                last = min(self.store.last_timestamp(t, interval) or now for t in tail)
+                for t, bars in fetch_many(self.upstream, tail, period=covering_period(last, now), interval=interval).items():
+                    self.store.append(t, interval, bars)
+                    self._synced[(t, interval)] = time.time()
+        except Exception as e:
+            log.warning(f"Upstream sync failed, serving stored bars: {e}")
@@ -0,0 +1,89 @@
+from __future__ import annotations
+import threading, time
+from typing import Dict, Iterable, Optional, Tuple
+import pandas as pd
+from .base import PriceProvider, fetch_many, fetch_quotes, provider_host, quote_currency
+from ..utils.concurrency import SingleFlight
+from ..utils.timing import span
+
+class _Snapshots:
+    """Quote snapshots for one upstream host, shared by every QuoteCache (engines, sessions, threads)."""
+    def __init__(self):
+        self.quotes: Dict[str, Tuple[float, Optional[Dict]]] = {}  # ticker -> (monotonic fetched_at, quote)
+        self.lock = threading.Lock()
+        self.flight = SingleFlight()
+
+_shared: Dict[str, _Snapshots] = {}
+_shared_lock = threading.Lock()
+
+def _snapshots_for(host: str) -> _Snapshots:
+    with _shared_lock:
+        snaps = _shared.get(host)
+        if snaps is None:
+            snaps = _shared[host] = _Snapshots()
+        return snaps
+
+class QuoteCache:
+    """Short-TTL quote cache in front of a PriceProvider; history calls pass straight through.
+
+    Quotes younger than `ttl_s` are served from a process-wide snapshot per upstream host. Missing tickers
+    are fetched with one bulk `quotes()` call, and a ticker another thread is already fetching is waited
+    on rather than requested again, so N viewers refreshing M tickers cost at most one upstream fetch per
+    ticker per TTL.
+    """
+    def __init__(self, inner: PriceProvider, ttl_s: float = 5.0, host: Optional[str] = None):
+        self.inner = inner
+        self.ttl_s = ttl_s
+        self.host = host or provider_host(inner)
+        self._snaps = _snapshots_for(self.host)
+
+    @classmethod
+    def from_config(cls, inner: PriceProvider, quotes_cfg: Dict) -> "QuoteCache":
+        return cls(inner, ttl_s=float(quotes_cfg.get("ttl_seconds", 5)))
+
+    def quote(self, ticker: str) -> Dict:
+        q = self._lookup([ticker]).get(ticker)
+        if q is None:
+            return {"ticker": ticker, "price": None, "prev_close": None, "currency": quote_currency(self.inner, ticker)}
+        return {**q, "currency": q.get("currency") or quote_currency(self.inner, ticker)}
+
+    def quotes(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        """Quotes with a price; tickers without one are left out."""
+        got = self._lookup(tickers)
+        return {t: dict(q) for t, q in got.items() if q is not None and q.get("price") is not None}
+
+    def _lookup(self, tickers: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Snapshot (or freshly fetched) quote per ticker; None when upstream returned nothing for it."""
+        tickers = list(dict.fromkeys(tickers))
+        now = time.monotonic()
+        snaps = self._snaps
+        out: Dict[str, Optional[Dict]] = {}
+        with snaps.lock:
+            for t in tickers:
+                hit = snaps.quotes.get(t)
+                if hit is not None and now - hit[0] < self.ttl_s:
+                    out[t] = hit[1]  # None / no price: not retried within the TTL either
+        missing = [t for t in tickers if t not in out]
+        with span("quotes.cache", tickers=len(tickers), hits=len(out), misses=len(missing)):
+            if missing:
+                out.update(snaps.flight.do_many(missing, self._fetch))
+        return {t: out.get(t) for t in tickers}
+
+    def _fetch(self, tickers) -> Dict[str, Dict]:
+        fetched = fetch_quotes(self.inner, tickers)
+        at = time.monotonic()
+        with self._snaps.lock:
+            for t in tickers:
+                q = fetched.get(t)
+                self._snaps.quotes[t] = (at, q)
+        return fetched
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        return self.inner.history(ticker, period=period, interval=interval)
+
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        return fetch_many(self.inner, tickers, period=period, interval=interval)
+
+def clear():
+    with _shared_lock:
+        _shared.clear()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+import threading, time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+import pandas as pd
+from .base import PriceProvider, fetch_many, fetch_quotes
+from ..utils.concurrency import SingleFlight, CircuitOpen, backoff_delay, breaker_for
+from ..utils.logging import get_logger
+from ..utils.timing import span
+
+log = get_logger("ResilientProvider")
+
+class ProviderUnavailable(RuntimeError):
+    pass
+
+class ResilientProvider:
+    """Retries, circuit breaking, request collapsing and stale fallback around an upstream PriceProvider.
+
+    Failed calls are retried with full-jitter exponential backoff. Consecutive failures open the breaker of
+    the upstream host (shared process-wide), after which calls fail fast instead of adding load. Identical
+    concurrent calls share one upstream request. When a call still fails, or returns no bars, the last good
+    result for the same request is served with `df.attrs["stale"] = True` (quotes get `"stale": True`).
+    """
+    def __init__(self, inner: PriceProvider, retries: int = 3, base_delay_s: float = 0.5, max_delay_s: float = 8.0,
+                 breaker_failures: int = 5, breaker_reset_s: float = 60.0, host: Optional[str] = None,
+                 max_fallbacks: int = 2048):
+        self.inner = inner
+        self.retries = retries
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.host = host or getattr(inner, "host", type(inner).__name__)
+        self.breaker = breaker_for(self.host, breaker_failures, breaker_reset_s)
+        self.max_fallbacks = max_fallbacks
+        self._flight = SingleFlight()
+        self._last: "OrderedDict[tuple, object]" = OrderedDict()  # request key -> last good frame / quote
+        self._last_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, inner: PriceProvider, cfg: Dict) -> "ResilientProvider":
+        return cls(inner, retries=int(cfg.get("retries", 3)), base_delay_s=float(cfg.get("base_delay_s", 0.5)),
+                   max_delay_s=float(cfg.get("max_delay_s", 8)), breaker_failures=int(cfg.get("breaker_failures", 5)),
+                   breaker_reset_s=float(cfg.get("breaker_reset_s", 60)), host=cfg.get("host"))
+
+    def quote(self, ticker: str) -> Dict:
+        key = ("quote", ticker)
+        try:
+            q = self._call(key, lambda: self.inner.quote(ticker))
+        except Exception as e:
+            last = self._fallback(key)
+            if last is None:
+                raise ProviderUnavailable(f"{self.host}: quote {ticker} failed: {e}") from e
+            return {**last, "stale": True}
+        self._remember(key, q)
+        return dict(q)
+
+    def quotes(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        err = None
+        try:
+            fetched = self._call(("quotes", tuple(tickers)), lambda: fetch_quotes(self.inner, tickers))
+        except Exception as e:
+            fetched, err = {}, e
+        out: Dict[str, Dict] = {}
+        for t in tickers:
+            q = fetched.get(t)
+            if q is not None:
+                self._remember(("quote", t), q)
+                out[t] = dict(q)
+            elif (last := self._fallback(("quote", t))) is not None:
+                out[t] = {**last, "stale": True}
+        if err is not None and not out:
+            raise ProviderUnavailable(f"{self.host}: quotes for {len(tickers)} tickers failed: {err}") from err
+        return out
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        key = ("history", ticker, period, interval)
+        df, err = None, None
+        try:
+            df = self._call(key, lambda: self.inner.history(ticker, period=period, interval=interval))
+        except Exception as e:
+            err = e
+        return self._frame(key, df, ticker, err)
+
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        err = None
+        try:
+            frames = self._call(("history_many", tuple(tickers), period, interval),
+                                lambda: fetch_many(self.inner, tickers, period=period, interval=interval))
+        except Exception as e:
+            frames, err = {}, e
+        out = {t: self._frame(("history", t, period, interval), frames.get(t), t, err, raise_missing=False) for t in tickers}
+        if err is not None and all(df.empty for df in out.values()):
+            raise ProviderUnavailable(f"{self.host}: history for {len(tickers)} tickers failed: {err}") from err
+        return out
+
+    def _frame(self, key: tuple, df: Optional[pd.DataFrame], ticker: str, err: Optional[Exception],
+               raise_missing: bool = True) -> pd.DataFrame:
+        if df is not None and not df.empty:
+            self._remember(key, df)
+            return df.copy()
+        last = self._fallback(key)
+        if last is not None:
+            stale = last.copy()
+            stale.attrs["stale"] = True
+            return stale
+        if err is not None and raise_missing:
+            raise ProviderUnavailable(f"{self.host}: history {ticker} failed: {err}") from err
+        return df if df is not None else pd.DataFrame()
+
+    def _call(self, key: tuple, fn):
+        def attempt():
+            for i in range(self.retries + 1):
+                if i:
+                    time.sleep(backoff_delay(i - 1, self.base_delay_s, self.max_delay_s))
+                try:
+                    with span("provider.attempt", host=self.host, call=key[0], attempt=i):
+                        return self.breaker.call(fn)
+                except CircuitOpen:
+                    raise
+                except Exception as e:
+                    if i == self.retries:
+                        raise
+                    log.warning(f"{self.host} {key[0]} failed (attempt {i + 1}/{self.retries + 1}): {e}")
+        return self._flight.do(key, attempt)[0]
+
+    def _remember(self, key: tuple, value):
+        with self._last_lock:
+            self._last[key] = value
+            self._last.move_to_end(key)
+            while len(self._last) > self.max_fallbacks:
+                self._last.popitem(last=False)
+
+    def _fallback(self, key: tuple):
+        with self._last_lock:
+            return self._last.get(key)
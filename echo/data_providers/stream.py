@@ -0,0 +1,367 @@
+from __future__ import annotations
+import asyncio, threading, time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Protocol
+import numpy as np
+import pandas as pd
+from .base import PriceProvider, fetch_many, fetch_quotes, quote_currency
+from ..utils.dates import period_start
+from ..utils.logging import get_logger
+
+log = get_logger("BarStream")
+
+# Streaming bar ingestion: a BarSource yields batches of new (or updated) bars, BarStream keeps the last
+# `window` bars per ticker in preallocated arrays and notifies subscribers, and StreamProvider serves
+# history() from those windows so rules and panels stop re-downloading whole periods on every refresh.
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+@dataclass(frozen=True)
+class Bar:
+    ticker: str
+    ts: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+
+def frame_bars(ticker: str, df: pd.DataFrame) -> List[Bar]:
+    """Bars for the rows of an OHLCV frame, in index order."""
+    if df is None or df.empty:
+        return []
+    cols = [df[c].to_numpy(dtype=float) if c in df else np.zeros(len(df)) for c in FIELDS]
+    return [Bar(ticker, ts, *vals) for ts, vals in zip(df.index, zip(*cols))]
+
+class BarSource(Protocol):
+    interval: str
+    def bars(self) -> Iterator[List[Bar]]: ...
+    def abars(self) -> AsyncIterator[List[Bar]]: ...
+
+class ReplaySource:
+    """Recorded bars replayed in time order, `batch` timestamps per yield (offline tests and demos)."""
+    def __init__(self, frames: Dict[str, pd.DataFrame], interval: str = "1d", batch: int = 1, delay_s: float = 0.0):
+        self.interval = interval
+        self.batch = max(1, batch)
+        self.delay_s = delay_s
+        bars = [b for t, df in frames.items() for b in frame_bars(t, df)]
+        self._bars = sorted(bars, key=lambda b: b.ts)
+
+    @classmethod
+    def from_csv(cls, path: str, **kw) -> "ReplaySource":
+        """CSV with ticker, Date and OHLCV columns (one row per bar, any ticker order)."""
+        raw = pd.read_csv(path, parse_dates=["Date"])
+        return cls({t: g.set_index("Date").sort_index() for t, g in raw.groupby("ticker")}, **kw)
+
+    def _batches(self) -> Iterator[List[Bar]]:
+        out: List[Bar] = []
+        stamps = 0
+        for i, b in enumerate(self._bars):
+            if i == 0 or b.ts != self._bars[i - 1].ts:
+                if stamps == self.batch:
+                    yield out
+                    out, stamps = [], 0
+                stamps += 1
+            out.append(b)
+        if out:
+            yield out
+
+    def bars(self) -> Iterator[List[Bar]]:
+        for batch in self._batches():
+            yield batch
+            if self.delay_s:
+                time.sleep(self.delay_s)
+
+    async def abars(self) -> AsyncIterator[List[Bar]]:
+        for batch in self._batches():
+            yield batch
+            if self.delay_s:
+                await asyncio.sleep(self.delay_s)
+
+class PollingSource:
+    """A polling PriceProvider as a bar stream. Each poll reads only a short `period` (the bar cache turns
+    that into a tail fetch) and yields bars at or after each ticker's last seen bar, so the still-forming
+    bar is re-sent whenever it changes."""
+    def __init__(self, provider: PriceProvider, tickers: Iterable[str], interval: str = "1d", period: str = "5d",
+                 poll_s: float = 60.0, stop: Optional[threading.Event] = None):
+        self.provider = provider
+        self.tickers = list(dict.fromkeys(tickers))
+        self.interval = interval
+        self.period = period
+        self.poll_s = poll_s
+        self.stop = stop or threading.Event()
+        self._seen: Dict[str, tuple] = {}  # ticker -> (last ts, last close)
+
+    def poll(self) -> List[Bar]:
+        frames = fetch_many(self.provider, self.tickers, period=self.period, interval=self.interval)
+        out: List[Bar] = []
+        for t, df in frames.items():
+            if df is None or df.empty:
+                continue
+            seen = self._seen.get(t)
+            new = df if seen is None else df[df.index >= seen[0]]
+            bars = frame_bars(t, new)
+            if seen is not None and bars and bars[0].ts == seen[0] and bars[0].close == seen[1]:
+                bars = bars[1:]  # last bar unchanged
+            if bars:
+                self._seen[t] = (bars[-1].ts, bars[-1].close)
+                out += bars
+        return out
+
+    def bars(self) -> Iterator[List[Bar]]:
+        while not self.stop.is_set():
+            try:
+                batch = self.poll()
+            except Exception as e:
+                log.warning(f"Poll failed: {e}")
+                batch = []
+            if batch:
+                yield batch
+            self.stop.wait(self.poll_s)
+
+    async def abars(self) -> AsyncIterator[List[Bar]]:
+        while not self.stop.is_set():
+            try:
+                batch = await asyncio.to_thread(self.poll)
+            except Exception as e:
+                log.warning(f"Poll failed: {e}")
+                batch = []
+            if batch:
+                yield batch
+            await asyncio.sleep(self.poll_s)
+
+class BarWindow:
+    """The last `size` bars of one ticker. Arrays hold 2×size rows and are compacted when full, so appending
+    (or replacing the still-forming last bar) is amortized O(1) and the window is always a contiguous slice."""
+    def __init__(self, size: int):
+        self.size = size
+        self.ts = np.empty(2 * size, dtype="int64")  # UTC nanoseconds
+        self.values = np.empty((2 * size, len(FIELDS)), dtype=float)
+        self.tz = None
+        self.since: Optional[int] = None  # UTC ns the window is known complete from (seeded history)
+        self._start = self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def upsert(self, bar: Bar) -> bool:
+        """Append a newer bar or overwrite the last one with the same timestamp; older bars are ignored."""
+        ts = pd.Timestamp(bar.ts)
+        if self.tz is None and self._end == 0:
+            self.tz = ts.tz
+        ns = (ts.tz_convert("UTC") if ts.tz is not None else ts).value
+        row = (bar.open, bar.high, bar.low, bar.close, bar.volume)
+        if self._end > self._start and ns <= self.ts[self._end - 1]:
+            if ns < self.ts[self._end - 1]:
+                return False
+            self.values[self._end - 1] = row
+            return True
+        if self._end == len(self.ts):
+            keep = self.size - 1
+            self.ts[:keep] = self.ts[self._end - keep:self._end]
+            self.values[:keep] = self.values[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        self.ts[self._end] = ns
+        self.values[self._end] = row
+        self._end += 1
+        if self._end - self._start > self.size:
+            self._start = self._end - self.size
+            self.since = None  # older bars dropped: coverage now starts at the first bar held
+        return True
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self.values[self._start:self._end, 3]
+
+    def arrays(self):
+        """(UTC ns timestamps, closes) views of the window."""
+        return self.ts[self._start:self._end], self.values[self._start:self._end, 3]
+
+    def covers(self, start: pd.Timestamp) -> bool:
+        """True if every bar at or after `start` (tz-aware) is in the window."""
+        if not len(self):
+            return False
+        first = int(self.ts[self._start])
+        return min(first, self.since if self.since is not None else first) <= start.tz_convert("UTC").value
+
+    def index(self) -> pd.DatetimeIndex:
+        idx = pd.DatetimeIndex(self.ts[self._start:self._end].astype("datetime64[ns]"), name="Date")
+        if self.tz is not None:
+            idx = idx.tz_localize("UTC").tz_convert(self.tz)
+        return idx
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values[self._start:self._end].copy(), index=self.index(), columns=list(FIELDS))
+
+class BarStream:
+    """Rolling in-memory bar windows fed incrementally from a BarSource.
+
+    `subscribe(fn)` registers `fn(ticker, window)`, called after every batch that changed the ticker.
+    """
+    def __init__(self, window: int = 260, interval: str = "1d"):
+        self.window = window
+        self.interval = interval
+        self._windows: Dict[str, BarWindow] = {}
+        self._subscribers: List[Callable[[str, BarWindow], None]] = []
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self.stop = threading.Event()  # ends `consume` (and the PollingSource built by `start_stream`)
+
+    def subscribe(self, fn: Callable[[str, BarWindow], None]) -> Callable[[], None]:
+        with self._lock:
+            self._subscribers.append(fn)
+        return lambda: self._subscribers.remove(fn)
+
+    def seed(self, frames: Dict[str, pd.DataFrame], since: Optional[pd.Timestamp] = None) -> List[str]:
+        """Load initial history (one full fetch covering everything from `since`); later bars arrive via `ingest`."""
+        bars = [b for t, df in frames.items() if df is not None for b in frame_bars(t, df.tail(self.window))]
+        changed = self.ingest(bars)
+        if since is not None:
+            with self._lock:
+                for t, df in frames.items():
+                    w = self._windows.get(t)
+                    if w is not None and df is not None and len(df) <= self.window:
+                        w.since = since.tz_convert("UTC").value
+        return changed
+
+    def ingest(self, bars: Iterable[Bar]) -> List[str]:
+        """Apply a batch of bars; returns the tickers whose window changed (after notifying subscribers)."""
+        changed: Dict[str, None] = {}
+        with self._lock:
+            for b in bars:
+                w = self._windows.get(b.ticker)
+                if w is None:
+                    w = self._windows[b.ticker] = BarWindow(self.window)
+                if w.upsert(b):
+                    changed[b.ticker] = None
+            subscribers = list(self._subscribers)
+        for t in changed:
+            for fn in subscribers:
+                try:
+                    fn(t, self._windows[t])
+                except Exception as e:
+                    log.exception(f"Bar subscriber failed for {t}: {e}")
+        return list(changed)
+
+    def consume(self, source: BarSource, max_batches: Optional[int] = None) -> int:
+        """Ingest batches from `source` until it ends, `stop` is set or `max_batches` were read."""
+        n = 0
+        for batch in source.bars():
+            self.ingest(batch)
+            n += 1
+            if self.stop.is_set() or (max_batches is not None and n >= max_batches):
+                break
+        return n
+
+    async def aconsume(self, source: BarSource) -> int:
+        n = 0
+        async for batch in source.abars():
+            self.ingest(batch)
+            n += 1
+            if self.stop.is_set():
+                break
+        return n
+
+    def start(self, source: BarSource) -> threading.Thread:
+        """Consume `source` on a daemon thread."""
+        self._thread = threading.Thread(target=self.consume, args=(source,), name="echo-bars", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def close(self):
+        self.stop.set()
+
+    def tickers(self) -> List[str]:
+        with self._lock:
+            return list(self._windows)
+
+    def window_of(self, ticker: str) -> Optional[BarWindow]:
+        return self._windows.get(ticker)
+
+    def frame(self, ticker: str, period: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """The ticker's window (sliced to `period`), or None if the window doesn't reach back that far."""
+        start = period_start(period, pd.Timestamp.now(tz="UTC")) if period is not None else None
+        if period is not None and start is None:
+            return None
+        with self._lock:
+            w = self._windows.get(ticker)
+            if w is None or (start is not None and not w.covers(start)):
+                return None
+            df = w.frame()
+        if start is None:
+            return df
+        start = start.tz_convert(df.index.tz) if df.index.tz is not None else start.tz_convert("UTC").tz_localize(None)
+        return df[df.index >= start]
+
+class StreamProvider:
+    """PriceProvider view of a BarStream: history at the stream's interval comes from the in-memory windows,
+    anything else (other intervals, unknown tickers, periods longer than the window) from `inner`."""
+    def __init__(self, stream: BarStream, inner: PriceProvider):
+        self.stream = stream
+        self.inner = inner
+
+    def quote(self, ticker: str) -> Dict:
+        q = self._quote(ticker)
+        return q if q is not None else self.inner.quote(ticker)
+
+    def quotes(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        out = {t: self._quote(t) for t in dict.fromkeys(tickers)}
+        missing = [t for t, q in out.items() if q is None]
+        if missing:
+            out.update(fetch_quotes(self.inner, missing))
+        return {t: q for t, q in out.items() if q is not None}
+
+    def _quote(self, ticker: str) -> Optional[Dict]:
+        w = self.stream.window_of(ticker)
+        if w is None or len(w) < 2:
+            return None
+        closes = w.closes
+        return {"ticker": ticker, "price": float(closes[-1]), "prev_close": float(closes[-2]),
+                "currency": quote_currency(self.inner, ticker)}
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        df = self.stream.frame(ticker, period) if interval == self.stream.interval else None
+        return df if df is not None else self.inner.history(ticker, period=period, interval=interval)
+
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(tickers))
+        out = {t: self.stream.frame(t, period) if interval == self.stream.interval else None for t in tickers}
+        missing = [t for t, df in out.items() if df is None]
+        if missing:
+            out.update(fetch_many(self.inner, missing, period=period, interval=interval))
+        return out
+
+def stream_tickers(cfg: Dict) -> List[str]:
+    """Slots, sector ETFs and `streaming.tickers`: everything the rules and dashboard panels chart."""
+    slots = [cfg["slots"][k] for k in ("core", "momentum", "wildcard")]
+    extra = (cfg.get("streaming", {}) or {}).get("tickers", []) or []
+    return list(dict.fromkeys(slots + list((cfg.get("sector_etfs", {}) or {}).values()) + list(extra)))
+
+def start_stream(engine) -> Optional[BarStream]:
+    """Build, seed and start the stream configured under `streaming:` (with online stats riding on it) and attach
+    both to `engine`; None if disabled."""
+    scfg = engine.config.get("streaming", {}) or {}
+    if not scfg.get("enabled", False):
+        return None
+    from ..engine.online_stats import OnlineStatsBook
+    interval = scfg.get("interval", "1d")
+    stream = BarStream(window=int(scfg.get("window", 260)), interval=interval)
+    stats = OnlineStatsBook.from_config(engine.config)
+    stats.attach(stream)
+    upstream = engine.provider
+    if scfg.get("source", "polling") == "replay":
+        source = ReplaySource.from_csv(scfg["replay_file"], interval=interval,
+                                       delay_s=float(scfg.get("replay_delay_s", 0.0)))
+    else:
+        tickers = stream_tickers(engine.config)
+        seed_period = scfg.get("seed_period", "1y")
+        try:
+            stream.seed(fetch_many(upstream, tickers, period=seed_period, interval=interval),
+                        since=period_start(seed_period))
+        except Exception as e:
+            log.warning(f"Seeding the bar stream failed, windows will fill from polls: {e}")
+        source = PollingSource(upstream, tickers, interval=interval, period=scfg.get("poll_period", "5d"),
+                               poll_s=float(scfg.get("poll_seconds", 60)), stop=stream.stop)
+    engine.attach_stream(stream, stats)
+    stream.start(source)
+    return stream
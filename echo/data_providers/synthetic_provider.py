@@ -0,0 +1,47 @@
+from __future__ import annotations
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+from ..utils.dates import period_start
+
+class SyntheticProvider:
+    """Deterministic offline provider: seeded random-walk daily bars per ticker ending at `end`.
+
+    Same ticker + seed always yields the same bars, so benchmarks and demos are reproducible without network.
+    """
+    def __init__(self, seed: int = 7, end: str = "2025-06-30", years: int = 10, tz: str = "America/New_York"):
+        self.seed = seed
+        self.end = pd.Timestamp(end, tz=tz)
+        self.years = years
+        self._index = pd.bdate_range(self.end - pd.DateOffset(years=years), self.end, tz=self.end.tz, name="Date")
+
+    @lru_cache(maxsize=4096)
+    def _bars(self, ticker: str) -> pd.DataFrame:
+        idx = self._index
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()) + self.seed)
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(idx))))
+        spread = np.abs(rng.normal(0, 0.006, len(idx))) * close
+        open_ = close * (1 + rng.normal(0, 0.004, len(idx)))
+        return pd.DataFrame({
+            "Open": open_, "High": np.maximum(open_, close) + spread, "Low": np.minimum(open_, close) - spread,
+            "Close": close, "Adj Close": close, "Volume": rng.integers(1_000_000, 5_000_000, len(idx)).astype(float),
+        }, index=idx)
+
+    def quote(self, ticker: str) -> Dict:
+        close = self._bars(ticker)["Close"]
+        return {"ticker": ticker, "price": float(close.iloc[-1]), "prev_close": float(close.iloc[-2]), "currency": "USD"}
+
+    def quotes(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        return {t: self.quote(t) for t in dict.fromkeys(tickers)}
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        if interval != "1d":
+            raise ValueError(f"SyntheticProvider only serves daily bars, got {interval}")
+        bars = self._bars(ticker)
+        start = period_start(period, self.end)
+        return (bars if start is None else bars[bars.index >= start]).copy()
+
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        return {t: self.history(t, period=period, interval=interval) for t in dict.fromkeys(tickers)}
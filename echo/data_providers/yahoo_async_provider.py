@@ -0,0 +1,107 @@
+from __future__ import annotations
+import asyncio
+from typing import Dict, Iterable, Optional
+import pandas as pd
+from ..utils.timing import span
+
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+
+YAHOO_BASE_URL = "https://query1.finance.yahoo.com"
+
+class AsyncYahooProvider:
+    """Async Yahoo chart-API client: one pooled aiohttp session, at most `max_concurrency` requests in flight.
+
+    `base_url` can point at a local stub server serving canned `/v8/finance/chart/{ticker}` payloads.
+    The session is bound to the running event loop; call `close()` before that loop ends.
+    """
+    def __init__(self, base_url: str = YAHOO_BASE_URL, max_concurrency: int = 8, timeout_s: float = 10):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp not installed. Run `pip install aiohttp`.")
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.timeout_s = timeout_s
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_config(cls, async_cfg: Dict) -> "AsyncYahooProvider":
+        return cls(base_url=async_cfg.get("base_url", YAHOO_BASE_URL),
+                   max_concurrency=int(async_cfg.get("max_concurrency", 8)),
+                   timeout_s=float(async_cfg.get("timeout_s", 10)))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = self._sem = self._loop = None
+
+    def _ensure_session(self) -> "aiohttp.ClientSession":
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout_s),
+                                                  headers={"User-Agent": "Mozilla/5.0 (echo)"})
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def _chart(self, ticker: str, range_: str, interval: str) -> Dict:
+        session = self._ensure_session()
+        params = {"range": range_, "interval": interval, "includePrePost": "false"}
+        async with self._sem:
+            with span("provider.http", provider="yahoo_async", ticker=ticker, range=range_, interval=interval):
+                async with session.get(f"{self.base_url}/v8/finance/chart/{ticker}", params=params) as resp:
+                    resp.raise_for_status()
+                    payload = await resp.json()
+        chart = payload.get("chart", {})
+        if chart.get("error"):
+            raise RuntimeError(f"Yahoo chart error for {ticker}: {chart['error']}")
+        result = chart.get("result") or []
+        if not result:
+            raise RuntimeError(f"Yahoo chart returned no result for {ticker}")
+        return result[0]
+
+    async def quote(self, ticker: str) -> Dict:
+        meta = (await self._chart(ticker, "1d", "1d")).get("meta", {})
+        price = meta.get("regularMarketPrice")
+        prev = meta.get("chartPreviousClose", meta.get("previousClose"))
+        return {
+            "ticker": ticker,
+            "price": float(price) if price is not None else None,
+            "prev_close": float(prev) if prev is not None else None,
+            "currency": meta.get("currency") or "USD",
+        }
+
+    async def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        return _chart_to_frame(await self._chart(ticker, period, interval))
+
+    async def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(tickers))
+        frames = await asyncio.gather(*(self.history(t, period, interval) for t in tickers), return_exceptions=True)
+        return {t: f if isinstance(f, pd.DataFrame) else pd.DataFrame() for t, f in zip(tickers, frames)}
+
+def _chart_to_frame(result: Dict) -> pd.DataFrame:
+    ts = result.get("timestamp") or []
+    if not ts:
+        return pd.DataFrame()
+    quote = (result.get("indicators", {}).get("quote") or [{}])[0]
+    adj = (result.get("indicators", {}).get("adjclose") or [{}])[0].get("adjclose")
+    tz = result.get("meta", {}).get("exchangeTimezoneName") or "UTC"
+    idx = pd.to_datetime(ts, unit="s", utc=True).tz_convert(tz)
+    df = pd.DataFrame({
+        "Open": quote.get("open"), "High": quote.get("high"), "Low": quote.get("low"),
+        "Close": quote.get("close"), "Adj Close": adj if adj is not None else quote.get("close"),
+        "Volume": quote.get("volume"),
+    }, index=idx)
+    df.index.name = "Date"
+    return df.dropna(subset=["Close"]).astype(float)
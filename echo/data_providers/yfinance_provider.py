@@ -1,26 +1,85 @@
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, Iterable
 import pandas as pd
+from .base import quote_currency
+from ..utils.timing import span
 
-try:
-    import yfinance as yf
-except Exception:
-    yf = None
+yf = None  # imported by the first YFinanceProvider(); yfinance takes ~1s to import
+
+def _load_yfinance():
+    global yf
+    if yf is None:
+        try:
+            import yfinance
+        except Exception:
+            raise RuntimeError("yfinance not installed. Run `pip install yfinance`.")
+        yf = yfinance
+    return yf
 
 class YFinanceProvider:
+    host = "finance.yahoo.com"  # circuit-breaker key (see ResilientProvider)
     def __init__(self):
-        if yf is None:
-            raise RuntimeError("yfinance not installed. Run `pip install yfinance`.")
+        _load_yfinance()
     def quote(self, ticker: str) -> Dict:
-        t = yf.Ticker(ticker)
-        info = t.fast_info
+        with span("provider.quote", provider="yfinance", ticker=ticker):
+            t = yf.Ticker(ticker)
+            info = t.fast_info
         return {
             "ticker": ticker,
             "price": float(info.last_price) if info.last_price is not None else None,
             "prev_close": float(info.previous_close) if info.previous_close is not None else None,
             "currency": info.currency or "USD",
         }
+    def quotes(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        """Last and previous close for many tickers from one batched 5-day download (instead of one
+        `fast_info` round trip per ticker); tickers without bars are left out. The download carries no currency,
+        so that is looked up once per ticker per process (`quote_currency`)."""
+        tickers = list(dict.fromkeys(tickers))
+        with span("provider.quotes", provider="yfinance", tickers=len(tickers)):
+            frames = self.history_many(tickers, period="5d", interval="1d")
+        out: Dict[str, Dict] = {}
+        for t, df in frames.items():
+            close = df["Close"].dropna() if not df.empty else df
+            if len(close):
+                out[t] = {"ticker": t, "price": float(close.iloc[-1]),
+                          "prev_close": float(close.iloc[-2]) if len(close) > 1 else None,
+                          "currency": quote_currency(self, t)}
+        return out
+    def currency(self, ticker: str) -> str:
+        with span("provider.currency", provider="yfinance", ticker=ticker):
+            return yf.Ticker(ticker).fast_info.currency or "USD"
     def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
-        t = yf.Ticker(ticker)
-        df = t.history(period=period, interval=interval, auto_adjust=False)
+        with span("provider.history", provider="yfinance", ticker=ticker, period=period, interval=interval):
+            t = yf.Ticker(ticker)
+            df = t.history(period=period, interval=interval, auto_adjust=False)
         return df
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        with span("provider.history_many", provider="yfinance", tickers=len(tickers), period=period, interval=interval):
+            raw = yf.download(tickers, period=period, interval=interval, group_by="ticker", ignore_tz=False,
+                              auto_adjust=False, progress=False, threads=True)
+        out: Dict[str, pd.DataFrame] = {}
+        for t in tickers:
+            if isinstance(raw.columns, pd.MultiIndex):
+                df = raw[t].copy() if t in raw.columns.get_level_values(0) else pd.DataFrame()
+            else:
+                df = raw.copy()
+            df = df.dropna(how="all")  # rows padded in by other tickers' sessions
+            if df.empty or not df["Close"].notna().any():
+                out[t] = pd.DataFrame()
+                continue
+            tz = _exchange_tz(t)  # same index tz as history(); the download aligns everything to one tz
+            if tz and df.index.tz is not None:
+                df.index = df.index.tz_convert(tz)
+            out[t] = df
+        return out
+
+def _exchange_tz(ticker: str):
+    """Exchange timezone from yfinance's tz cache (filled by the download itself), or None."""
+    try:
+        from yfinance import cache
+        return cache.get_tz_cache().lookup(ticker)
+    except Exception:
+        return None
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+from ..data_providers.base import fetch_many
+from ..rules.base import Rule
+from ..rules.registry import DEFAULT_RULES, build_rules, rule_specs
+from ..utils.calendar_index import CalendarIndex
+from .fusion import FusionModel
+
+HORIZONS = (1, 5, 20)
+
+BACKTEST_RULES = ("fomc_tilt", "turn_of_month", "pead")  # calendar heuristics with vectorized score_series
+
+def default_rules(config: Optional[Dict] = None) -> List[Rule]:
+    """The config's enabled calendar rules (all of them when no config is given)."""
+    specs = rule_specs(config) if config is not None else DEFAULT_RULES
+    return build_rules([(name, params) for name, params in specs if name in BACKTEST_RULES])
+
+@dataclass
+class BacktestResult:
+    frame: pd.DataFrame      # one row per trading day: signal scores, fused composite, fwd{h}d:{ticker}
+    signals: List[str]
+    returns: List[str]
+
+    def summary(self) -> pd.DataFrame:
+        """Mean forward return on days each signal (and the composite) is active versus all days."""
+        active = self.frame[self.signals + ["composite"]] > 0
+        fwd = self.frame[self.returns]
+        base = fwd.mean()
+        on = active.astype(float).T.dot(fwd.fillna(0.0)) / active.astype(float).T.dot(fwd.notna().astype(float))
+        out = on.sub(base, axis=1).stack().rename("edge").to_frame()
+        out["mean_active"] = on.stack()
+        out["days_active"] = active.sum().reindex(out.index.get_level_values(0)).values
+        out.index.names = ["signal", "forward_return"]
+        return out
+
+def load_closes(provider, tickers: Iterable[str], period: str = "10y", interval: str = "1d") -> pd.DataFrame:
+    """Close matrix (dates × tickers) with a tz-naive daily index, from one batched provider call."""
+    frames = fetch_many(provider, tickers, period=period, interval=interval)
+    cols: Dict[str, pd.Series] = {}
+    for t, df in frames.items():
+        if df is None or df.empty:
+            continue
+        c = df["Close"].copy()
+        if c.index.tz is not None:
+            c.index = c.index.tz_localize(None)
+        cols[t] = c.groupby(c.index.normalize()).last()
+    return pd.DataFrame(cols).sort_index()
+
+def run_backtest(config: Dict, closes: pd.DataFrame, start: Optional[str] = None, end: Optional[str] = None,
+                 rules: Optional[List[Rule]] = None) -> BacktestResult:
+    slots = {k: config["slots"][k] for k in ["core", "momentum", "wildcard"]}
+    context = {"config": config, "slots": slots, "tz": config.get("timezone", "America/Chicago"),
+               "calendar": CalendarIndex.from_config(config)}
+    rules = rules if rules is not None else default_rules(config)
+
+    fwd = pd.DataFrame({f"fwd{h}d:{t}": closes[t].shift(-h) / closes[t] - 1.0
+                        for t in dict.fromkeys(slots.values()) if t in closes for h in HORIZONS},
+                       index=closes.index)
+    dates = closes.loc[start:end].index
+    scores = pd.concat([r.score_series(dates, context) for r in rules], axis=1)
+    composite = FusionModel.from_config(config).composite(scores.to_numpy(dtype=float), list(scores.columns))
+    frame = scores.assign(composite=composite).join(fwd.loc[dates])
+    return BacktestResult(frame=frame, signals=list(scores.columns), returns=list(fwd.columns))
@@ -0,0 +1,149 @@
+from __future__ import annotations
+import glob, hashlib, os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import pandas as pd
+from ..data_providers.base import fetch_many, fetch_quotes
+from ..utils.dates import now_tz
+from ..utils.logging import get_logger
+from .echo_engine import EchoEngine, Verdict
+from .reports import format_daily
+
+log = get_logger("EchoBatch")
+
+FrameKey = Tuple[str, str, str]  # (ticker, period, interval)
+
+@dataclass
+class BatchItem:
+    config_path: str
+    report_path: Optional[str]
+    verdict: Optional[Verdict]
+    error: Optional[str] = None
+
+def collect_configs(paths: Iterable[str]) -> List[str]:
+    """Expand directories to their *.yaml/*.yml files; keep explicit files as given (deduplicated, ordered)."""
+    out: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            out.extend(sorted(glob.glob(os.path.join(p, "*.yaml")) + glob.glob(os.path.join(p, "*.yml"))))
+        else:
+            out.append(p)
+    return list(dict.fromkeys(out))
+
+class _PrefetchedProvider:
+    """Serves history for prefetched (ticker, period, interval) keys; everything else goes to `inner`."""
+    def __init__(self, frames: Dict[FrameKey, pd.DataFrame], inner):
+        self.frames = frames
+        self.inner = inner
+    def quote(self, ticker: str) -> Dict:
+        return self.inner.quote(ticker)
+    def quotes(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        return fetch_quotes(self.inner, tickers)
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        df = self.frames.get((ticker, period, interval))
+        return df.copy() if df is not None else self.inner.history(ticker, period=period, interval=interval)
+    def history_many(self, tickers: Iterable[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(tickers))
+        missing = [t for t in tickers if (t, period, interval) not in self.frames]
+        fetched = fetch_many(self.inner, missing, period=period, interval=interval) if missing else {}
+        return {t: self.frames[(t, period, interval)].copy() if t not in missing else fetched.get(t, pd.DataFrame())
+                for t in tickers}
+
+class _LazyProvider:
+    """The engine's own provider stack, built only when a call misses the prefetched frames."""
+    def __init__(self, eng: EchoEngine):
+        self._eng = eng
+        self._provider = None
+    def __getattr__(self, name):
+        if self._provider is None:
+            self._provider = self._eng._build_provider(self._eng.config)
+        return getattr(self._provider, name)
+
+def data_keys(eng: EchoEngine) -> Set[FrameKey]:
+    context = eng._context(now_tz(eng.tz))
+    return {k for r in eng.rules for k in r.data_inputs(context)}
+
+def provider_key(eng: EchoEngine) -> str:
+    """Configs with the same `providers.price_data` section read the same data and share a prefetch."""
+    return repr(eng.config.get("providers", {}).get("price_data", {}))
+
+def prefetch(engines: Dict[str, EchoEngine]) -> Dict[str, Dict[FrameKey, pd.DataFrame]]:
+    """Fetch the union of every config's rule data inputs through each distinct provider, one batched call per
+    (period, interval); returns provider_key -> frames."""
+    providers: Dict[str, EchoEngine] = {}
+    groups: Dict[str, Dict[Tuple[str, str], set]] = defaultdict(lambda: defaultdict(set))
+    for eng in engines.values():
+        key = provider_key(eng)
+        providers.setdefault(key, eng)
+        for ticker, period, interval in data_keys(eng):
+            groups[key][(period, interval)].add(ticker)
+    out: Dict[str, Dict[FrameKey, pd.DataFrame]] = {}
+    for key, wanted in groups.items():
+        frames = out[key] = {}
+        for (period, interval), tickers in wanted.items():
+            try:
+                for t, df in fetch_many(providers[key].provider, sorted(tickers), period=period, interval=interval).items():
+                    if df is not None and not df.empty:
+                        frames[(t, period, interval)] = df
+            except Exception as e:
+                log.warning(f"Prefetch {period}/{interval} failed, configs will fetch on their own: {e}")
+    return out
+
+def report_name(config_path: str) -> str:
+    """<parent dir>_<config name>_<hash of the full path>.md, so acctA/config.yaml and acctB/config.yaml differ."""
+    path = os.path.abspath(config_path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{os.path.basename(os.path.dirname(path))}_{stem}_{hashlib.sha1(path.encode()).hexdigest()[:6]}.md"
+
+def _run_one(config_path: str, frames: Dict[FrameKey, pd.DataFrame]) -> Tuple[Verdict, str]:
+    eng = EchoEngine(config_path)
+    eng.provider = _PrefetchedProvider(frames, _LazyProvider(eng))
+    verdict = eng.run()
+    return verdict, format_daily(verdict)
+
+def run_batch(config_paths: List[str], out_dir: str, workers: Optional[int] = None) -> List[BatchItem]:
+    engines: Dict[str, EchoEngine] = {}
+    items: List[BatchItem] = []
+    for p in config_paths:
+        try:
+            engines[p] = EchoEngine(p)
+        except Exception as e:
+            log.exception(f"Config {p} could not be loaded: {e}")
+            items.append(BatchItem(p, None, None, error=str(e)))
+    frames = prefetch(engines)
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for p, eng in engines.items():
+            shared = frames.get(provider_key(eng), {})
+            needed = {k: shared[k] for k in data_keys(eng) if k in shared}
+            futures[p] = pool.submit(_run_one, p, needed)
+        for p, fut in futures.items():
+            try:
+                verdict, report = fut.result()
+            except Exception as e:
+                log.exception(f"Config {p} failed: {e}")
+                items.append(BatchItem(p, None, None, error=str(e)))
+                continue
+            report_path = os.path.join(out_dir, report_name(p))
+            with open(report_path, "w", encoding="utf-8") as f:
+                f.write(report)
+            items.append(BatchItem(p, report_path, verdict))
+    write_index(items, out_dir)
+    return items
+
+def write_index(items: List[BatchItem], out_dir: str) -> str:
+    lines = ["# Echo Batch Summary", "", "| Config | As of | Conviction | Risk | Actions | Report |", "|---|---|---|---|---|---|"]
+    for it in items:
+        if it.verdict is None:
+            lines.append(f"| {it.config_path} | — | — | FAILED | — | {it.error} |")
+            continue
+        v = it.verdict
+        lines.append(f"| {it.config_path} | {v.asof} | {v.composite:.0f}/100 | {v.risk_label} | {len(v.actions)} "
+                     f"| [{os.path.basename(it.report_path)}]({os.path.basename(it.report_path)}) |")
+    path = os.path.join(out_dir, "index.md")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
@@ -1,17 +1,16 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Dict
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Optional, Tuple
+import asyncio, contextvars, threading, time
 import yaml
 from ..utils.dates import now_tz, fmt_ts
 from ..utils.logging import get_logger
-from ..data_providers.yfinance_provider import YFinanceProvider
+from ..utils.timing import Tracer, span, tracing, record
+from ..utils.calendar_index import CalendarIndex
 from ..rules.base import Rule, Signal
-from ..rules.fomc_tilt import FOMCTilt
-from ..rules.tom_window import TurnOfMonth
-from ..rules.pead import PEAD
-from ..rules.volatility_regime import VolatilityRegime
-from ..rules.execution_precision import ExecutionPrecision
-from ..rules.loan_accelerator import LoanAccelerator
+from ..rules.registry import rules_from_config
+from .fusion import FusionModel
 
 log = get_logger("EchoEngine")
 
@@ -24,45 +23,164 @@ class Verdict:
     signals: List[Signal]
     actions: List[str]
     allocations: Dict[str, str]
+    timings: Dict[str, float] = field(default_factory=dict)  # rule label -> wall seconds
+    reused: List[str] = field(default_factory=list)          # rule labels served from the previous run
+    trace: List[Dict] = field(default_factory=list)          # timing spans when tracing is on (utils.timing)
+
+def load_config(config_path: str) -> Dict:
+    with open(config_path, "r") as f:
+        return yaml.safe_load(f)
 
 class EchoEngine:
     def __init__(self, config_path: str = "echo/config.yaml"):
-        with open(config_path, "r") as f:
-            self.config = yaml.safe_load(f)
+        t0 = time.perf_counter()
+        self.config = load_config(config_path)
+        t1 = time.perf_counter()
         self.tz = self.config.get("timezone","America/Chicago")
-        self.provider = self._build_provider(self.config)
+        self._provider = None  # built on first use (see `provider`)
+        self._provider_lock = threading.Lock()
+        self.aprovider = self._build_async_provider(self.config)
+        # Init costs are attached to the first traced verdict, since tracing is only known after parsing.
+        self._init_spans = [("engine.config_load", t0, t1 - t0, {"path": config_path})]
         self.slots = {k:self.config["slots"][k] for k in ["core","momentum","wildcard"]}
-        self.rules: List[Rule] = [
-            FOMCTilt(),
-            TurnOfMonth(),
-            PEAD("momentum"),
-            PEAD("wildcard"),
-            VolatilityRegime(),
-            ExecutionPrecision(),
-            LoanAccelerator(),
-        ]
+        self.calendar = CalendarIndex.from_config(self.config)
+        self.rules: List[Rule] = rules_from_config(self.config)  # only the enabled ones are ever built
+        self.fusion = FusionModel.from_config(self.config)
+        self.stats = None  # OnlineStatsBook when a bar stream is attached
+        self._memo: Dict[int, Tuple[tuple, Signal, float]] = {}  # id(rule) -> (input key, last signal, epoch computed)
+
+    @property
+    def provider(self):
+        """Price provider, built (and its modules imported) the first time anything asks for it."""
+        if self._provider is None:
+            with self._provider_lock, span("engine.provider_build"):
+                if self._provider is None:
+                    self._provider = self._build_provider(self.config)
+        return self._provider
+
+    @provider.setter
+    def provider(self, value):
+        self._provider = value
 
     def _build_provider(self, cfg):
-        name = cfg.get("providers",{}).get("price_data",{}).get("name","yfinance")
+        pd_cfg = cfg.get("providers",{}).get("price_data",{})
+        name = pd_cfg.get("name","yfinance")
         if name == "yfinance":
-            return YFinanceProvider()
-        raise ValueError(f"Unknown provider: {name}")
+            from ..data_providers.yfinance_provider import YFinanceProvider
+            provider = YFinanceProvider()
+        elif name == "local":
+            from ..data_providers.local_store import LocalBarStore, LocalStoreProvider
+            from ..data_providers.yfinance_provider import YFinanceProvider
+            local_cfg = pd_cfg.get("local", {})
+            upstream = YFinanceProvider() if local_cfg.get("upstream", "yfinance") == "yfinance" else None
+            if upstream is not None:
+                upstream = self._resilient(upstream, pd_cfg)
+            provider = LocalStoreProvider(LocalBarStore(local_cfg.get("root", "data/bars")), upstream=upstream,
+                                          refresh_seconds=local_cfg.get("refresh_seconds", 300))
+        elif name == "synthetic":
+            from ..data_providers.synthetic_provider import SyntheticProvider
+            provider = SyntheticProvider(**pd_cfg.get("synthetic", {}))
+        else:
+            raise ValueError(f"Unknown provider: {name}")
+        if name != "local":
+            provider = self._resilient(provider, pd_cfg)
+        cache_cfg = pd_cfg.get("cache", {})
+        if cache_cfg.get("enabled", False) and name != "local":  # the local store already persists bars
+            from ..data_providers.cached_provider import CachedProvider
+            provider = CachedProvider.from_config(provider, cache_cfg)
+        quotes_cfg = pd_cfg.get("quotes", {})
+        if float(quotes_cfg.get("ttl_seconds", 0)) > 0:
+            from ..data_providers.quote_cache import QuoteCache
+            provider = QuoteCache.from_config(provider, quotes_cfg)
+        return provider
+
+    @staticmethod
+    def _resilient(provider, pd_cfg: Dict):
+        res_cfg = pd_cfg.get("resilience", {})
+        if not res_cfg.get("enabled", False):
+            return provider
+        from ..data_providers.resilient_provider import ResilientProvider
+        return ResilientProvider.from_config(provider, res_cfg)
 
-    def run(self) -> Verdict:
-        now = now_tz(self.tz)
-        context = {"now": now, "tz": self.tz, "config": self.config, "provider": self.provider, "slots": self.slots}
-        signals: List[Signal] = []
+    def _build_async_provider(self, cfg):
+        async_cfg = cfg.get("providers",{}).get("price_data",{}).get("async",{})
+        if not async_cfg.get("enabled", False):
+            return None
+        from ..data_providers.yahoo_async_provider import AsyncYahooProvider
+        return AsyncYahooProvider.from_config(async_cfg)
+
+    def attach_stream(self, stream, stats=None):
+        """Serve history from a BarStream's windows and recompute a data rule as soon as one of its tickers
+        receives a bar, instead of waiting out `engine.data_refresh_seconds`. `stats` (an OnlineStatsBook fed
+        by the same stream) is exposed to rules as `context["stats"]`."""
+        from ..data_providers.stream import StreamProvider
+        self.provider = StreamProvider(stream, self.provider)
+        self.stats = stats
+        context = self._context(now_tz(self.tz))
+        readers: Dict[str, List[int]] = {}
         for r in self.rules:
+            for ticker, _, interval in r.data_inputs(context):
+                if interval == stream.interval:
+                    readers.setdefault(ticker, []).append(id(r))
+        stream.subscribe(lambda ticker, _window: [self._memo.pop(i, None) for i in readers.get(ticker, ())])
+
+    def _context(self, now) -> Dict:
+        provider = self._provider if self._provider is not None else _LazyProvider(self)
+        return {"now": now, "tz": self.tz, "config": self.config, "provider": provider,
+                "aprovider": self.aprovider, "slots": self.slots, "calendar": self.calendar, "stats": self.stats}
+
+    def _tracer(self, trace: Optional[bool]) -> Optional[Tracer]:
+        if trace is None:
+            trace = self.config.get("engine", {}).get("trace", False)
+        if not trace:
+            return None
+        tracer = Tracer()
+        for name, start, dur, attrs in self._init_spans:
+            record(tracer, name, start, dur, **attrs)
+        self._init_spans = []
+        return tracer
+
+    def run(self, trace: Optional[bool] = None) -> Verdict:
+        """Compute a verdict; `trace` (default `engine.trace`) attaches timing spans to `Verdict.trace`."""
+        tracer = self._tracer(trace)
+        with tracing(tracer), span("engine.run", mode="sync"):
+            now = now_tz(self.tz)
+            verdict = self._verdict(now, self._run_rules(self._context(now)))
+        if tracer is not None:
+            verdict.trace = tracer.spans
+        return verdict
+
+    async def arun(self, trace: Optional[bool] = None) -> Verdict:
+        """Async counterpart of `run`: rules are awaited concurrently via `Rule.arun` on the running loop."""
+        tracer = self._tracer(trace)
+        with tracing(tracer), span("engine.run", mode="async"):
+            now = now_tz(self.tz)
+            verdict = self._verdict(now, await self._arun_rules(self._context(now)))
+        if tracer is not None:
+            verdict.trace = tracer.spans
+        return verdict
+
+    def run_async(self) -> Verdict:
+        """Run `arun` on a fresh event loop and release the async provider's connection pool afterwards."""
+        async def main():
             try:
-                signals.append(r.run(context))
-            except Exception as e:
-                log.exception(f"Rule {r.__class__.__name__} failed: {e}")
+                return await self.arun()
+            finally:
+                if self.aprovider is not None:
+                    await self.aprovider.close()
+        return asyncio.run(main())
 
-        composite = sum(s.score for s in signals)/len(signals) if signals else 0.0
-        risk_label = "Moderate"
-        for s in signals:
-            if s.severity == "red": risk_label = "High"; break
-            if s.severity == "yellow": risk_label = "Elevated"
+    def _verdict(self, now, results: List[Tuple[Optional[Signal], Optional[float]]]) -> Verdict:
+        signals: List[Signal] = [s for s, _ in results if s is not None]
+        labels = _rule_labels(self.rules)
+        timings = {k: dt for k, (_, dt) in zip(labels, results) if dt is not None}
+        reused = [k for k, (_, dt) in zip(labels, results) if dt is None]
+        # Reused signals are as old as the run that computed them; fusion decays their weight by age.
+        t = time.time()
+        ages = [0.0 if dt is not None else t - self._memo.get(id(r), (None, None, t))[2]
+                for r, (s, dt) in zip(self.rules, results) if s is not None]
+
+        composite, risk_label, signals = self.fusion.fuse(signals, ages)
         cap_efficiency = min(100.0, max(10.0, composite))
         actions: List[str] = []
         for s in signals:
@@ -74,4 +192,142 @@ class EchoEngine:
                 actions.append("Loan: ACTIVE — deploy ≤ 55% of loan, repay with first +10% trim; cut at −6% per rule.")
         allocations = {"Core": self.slots["core"], "Momentum": self.slots["momentum"], "Wildcard": self.slots["wildcard"]}
         return Verdict(asof=f"{fmt_ts(now)} {self.tz}", composite=composite, risk_label=risk_label,
-                       cap_efficiency=cap_efficiency, signals=signals, actions=actions, allocations=allocations)
+                       cap_efficiency=cap_efficiency, signals=signals, actions=actions, allocations=allocations,
+                       timings=timings, reused=reused)
+
+    def _plan(self, context) -> Tuple[List[Optional[tuple]], List[Rule]]:
+        """Input keys per rule and the rules that must actually run (all of them unless `engine.incremental`)."""
+        eng_cfg = self.config.get("engine", {})
+        if not eng_cfg.get("incremental", False):
+            return [None] * len(self.rules), list(self.rules)
+        refresh = float(eng_cfg.get("data_refresh_seconds", 300))
+        keys = [r.input_key(context, refresh) for r in self.rules]
+        todo = [r for r, k in zip(self.rules, keys) if k is None or self._memo.get(id(r), (None,))[0] != k]
+        return keys, todo
+
+    def _merge(self, keys: List[Optional[tuple]], todo: List[Rule],
+               fresh: List[Tuple[Optional[Signal], float]]) -> List[Tuple[Optional[Signal], Optional[float]]]:
+        """Rule-ordered results; reused signals carry a wall time of None."""
+        by_rule = {id(r): res for r, res in zip(todo, fresh)}
+        results: List[Tuple[Optional[Signal], Optional[float]]] = []
+        for r, k in zip(self.rules, keys):
+            if id(r) not in by_rule:
+                results.append((self._memo.get(id(r), (None, None))[1], None))
+                continue
+            sig, dt = by_rule[id(r)]
+            if k is not None and sig is not None:
+                self._memo[id(r)] = (k, sig, time.time())
+            else:
+                self._memo.pop(id(r), None)
+            results.append((sig, dt))
+        return results
+
+    def _run_rules(self, context) -> List[Tuple[Optional[Signal], Optional[float]]]:
+        """Run (or reuse) every rule, returning (signal or None, wall seconds) in `self.rules` order."""
+        keys, todo = self._plan(context)
+        return self._merge(keys, todo, self._execute(todo, context))
+
+    def _execute(self, rules: List[Rule], context) -> List[Tuple[Optional[Signal], float]]:
+        eng_cfg = self.config.get("engine", {})
+        if eng_cfg.get("execution", "sequential") == "parallel" and len(rules) > 1:
+            return self._run_parallel(rules, context, int(eng_cfg.get("max_workers", 4)), float(eng_cfg.get("rule_timeout_s", 10)))
+        results = []
+        for r in rules:
+            t0 = time.perf_counter()
+            try:
+                with span("rule.run", rule=_rule_label(r)):
+                    sig = r.run(context)
+            except Exception as e:
+                log.exception(f"Rule {_rule_label(r)} failed: {e}")
+                sig = None
+            results.append((sig, time.perf_counter() - t0))
+        return results
+
+    async def _arun_rules(self, context) -> List[Tuple[Optional[Signal], Optional[float]]]:
+        keys, todo = self._plan(context)
+        eng_cfg = self.config.get("engine", {})
+        timeout = float(eng_cfg.get("rule_timeout_s", 10))
+        # Sync rules (the default `Rule.arun`) run on a pool of our own rather than the loop's default executor,
+        # so a timed-out rule's thread is abandoned instead of holding up `asyncio.run` on exit.
+        pool = ThreadPoolExecutor(max_workers=max(1, int(eng_cfg.get("max_workers", 4))), thread_name_prefix="echo-rule")
+        loop = asyncio.get_running_loop()
+
+        def start(r: Rule):
+            if type(r).arun is Rule.arun:
+                return loop.run_in_executor(pool, contextvars.copy_context().run, r.run, context)
+            return r.arun(context)
+
+        async def call(r: Rule) -> Tuple[Optional[Signal], float]:
+            t0 = time.perf_counter()
+            try:
+                with span("rule.run", rule=_rule_label(r)):
+                    sig = await asyncio.wait_for(start(r), timeout)
+            except asyncio.TimeoutError:
+                log.warning(f"Rule {_rule_label(r)} timed out after {timeout:.1f}s")
+                sig = None
+            except Exception as e:
+                log.exception(f"Rule {_rule_label(r)} failed: {e}")
+                sig = None
+            return sig, time.perf_counter() - t0
+
+        try:
+            return self._merge(keys, todo, list(await asyncio.gather(*(call(r) for r in todo))))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run_parallel(self, rules: List[Rule], context, max_workers: int, timeout: float) -> List[Tuple[Optional[Signal], float]]:
+        started: Dict[int, float] = {}
+        results: List[Tuple[Optional[Signal], float]] = [(None, 0.0)] * len(rules)
+
+        def call(i: int, r: Rule) -> Tuple[Signal, float]:
+            started[i] = time.perf_counter()
+            with span("rule.run", rule=_rule_label(r)):
+                sig = r.run(context)
+            return sig, time.perf_counter() - started[i]
+
+        pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="echo-rule")
+        futures = {pool.submit(contextvars.copy_context().run, call, i, r): i for i, r in enumerate(rules)}
+        pending = set(futures)
+        try:
+            while pending:
+                running = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+                wait_s = max(0.0, min(running) - time.perf_counter()) if running else timeout
+                done, pending = wait(pending, timeout=wait_s, return_when=FIRST_COMPLETED)
+                now = time.perf_counter()
+                for f in done:
+                    i = futures[f]
+                    try:
+                        results[i] = f.result()
+                    except Exception as e:
+                        log.exception(f"Rule {_rule_label(rules[i])} failed: {e}")
+                        results[i] = (None, now - started.get(i, now))
+                for f in [f for f in pending if futures[f] in started and now - started[futures[f]] >= timeout]:
+                    i = futures[f]
+                    log.warning(f"Rule {_rule_label(rules[i])} timed out after {timeout:.1f}s")
+                    results[i] = (None, now - started[i])
+                    pending.discard(f)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+class _LazyProvider:
+    """Rule-context stand-in for `EchoEngine.provider`: runs whose rules never fetch data never build it."""
+    __slots__ = ("_engine",)
+    def __init__(self, engine: "EchoEngine"):
+        self._engine = engine
+    def __getattr__(self, name):
+        return getattr(self._engine.provider, name)
+
+def _rule_label(r: Rule) -> str:
+    slot = getattr(r, "slot_key", None)
+    return f"{r.__class__.__name__}[{slot}]" if slot else r.__class__.__name__
+
+def _rule_labels(rules: List[Rule]) -> List[str]:
+    """`_rule_label` per rule, with "#2", "#3", ... appended to repeats so timings don't overwrite each other."""
+    seen: Dict[str, int] = {}
+    labels = []
+    for r in rules:
+        label = _rule_label(r)
+        seen[label] = seen.get(label, 0) + 1
+        labels.append(label if seen[label] == 1 else f"{label}#{seen[label]}")
+    return labels
@@ -0,0 +1,129 @@
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from ..rules.base import Signal
+
+# Signal fusion: Composite Conviction and the risk label from a set of signal scores. Everything works on a
+# score array whose last axis is signals (one verdict, dates × signals in a backtest, portfolios × signals in a
+# batch), so a million-row backtest is a handful of NumPy reductions.
+#
+# Weights, half-lives and severity overrides are keyed by signal name, or by the prefix before ":" so that
+# "PEAD" covers "PEAD:AMZN", "PEAD:NVDA", ... An exact name wins over its prefix.
+
+SEVERITIES = ("green", "yellow", "red")
+RISK_LABELS = np.array(["Moderate", "Elevated", "High"], dtype=object)  # indexed by the highest severity code
+_CODES = {s: i for i, s in enumerate(SEVERITIES)}
+DEFAULT_WEIGHTS = {"Kill Switch": 0.0}  # guard signals act through the risk label, not conviction; config can override
+
+def _lookup(table: Dict[str, float], name: str, default):
+    if name in table:
+        return table[name]
+    return table.get(name.split(":", 1)[0], default)
+
+@dataclass(frozen=True)
+class SeverityOverride:
+    """Force `severity` on a signal whenever min_score <= score <= max_score."""
+    signal: str
+    severity: str
+    min_score: float = float("-inf")
+    max_score: float = float("inf")
+
+    def matches(self, name: str) -> bool:
+        return name == self.signal or name.split(":", 1)[0] == self.signal
+
+class FusionModel:
+    def __init__(self, weights: Optional[Dict[str, float]] = None, half_lives_s: Optional[Dict[str, float]] = None,
+                 overrides: Sequence[SeverityOverride] = (), default_weight: float = 1.0):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.half_lives_s = dict(half_lives_s or {})
+        self.overrides = list(overrides)
+        self.default_weight = float(default_weight)
+        for o in self.overrides:
+            if o.severity not in _CODES:
+                raise ValueError(f"Unknown severity in fusion override for {o.signal}: {o.severity}")
+        self._vectors: Dict[Tuple[str, ...], Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_config(cls, cfg: Dict) -> "FusionModel":
+        fcfg = cfg.get("fusion", {}) or {}
+        overrides = [SeverityOverride(o["signal"], o["severity"], float(o.get("min_score", float("-inf"))),
+                                      float(o.get("max_score", float("inf"))))
+                     for o in fcfg.get("severity_overrides", []) or []]
+        return cls(weights={k: float(v) for k, v in (fcfg.get("weights", {}) or {}).items()},
+                   half_lives_s={k: float(v) * 60 for k, v in (fcfg.get("half_life_min", {}) or {}).items()},
+                   overrides=overrides, default_weight=fcfg.get("default_weight", 1.0))
+
+    def vectors(self, names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(weights, half-lives in seconds, inf = no decay) aligned with `names`; cached per name tuple."""
+        key = tuple(names)
+        hit = self._vectors.get(key)
+        if hit is None:
+            hit = (np.array([_lookup(self.weights, n, self.default_weight) for n in key], dtype=float),
+                   np.array([_lookup(self.half_lives_s, n, np.inf) for n in key], dtype=float))
+            self._vectors[key] = hit
+        return hit
+
+    def effective_weights(self, names: Sequence[str], ages=None) -> np.ndarray:
+        """Per-signal weights, halved every half-life of signal age (seconds, broadcast against the scores)."""
+        w, half = self.vectors(names)
+        if ages is None:
+            return w
+        return w * np.exp2(-np.maximum(np.asarray(ages, dtype=float), 0.0) / half)
+
+    def composite(self, scores, names: Sequence[str], ages=None) -> np.ndarray:
+        """Weighted mean over the last axis, skipping NaN scores; 0 where nothing contributes."""
+        s = np.asarray(scores, dtype=float)
+        w = np.maximum(self.effective_weights(names, ages), 0.0)
+        missing = np.isnan(s)
+        if w.ndim == 1:  # one weight per signal: two matrix-vector products
+            num = np.where(missing, 0.0, s) @ w
+            den = (~missing).astype(float) @ w
+        else:
+            w = np.where(missing, 0.0, np.broadcast_to(w, s.shape))
+            num = (np.where(missing, 0.0, s) * w).sum(axis=-1)
+            den = w.sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(den > 0, num / den, 0.0)
+
+    def severity_codes(self, scores, names: Sequence[str], codes=None) -> np.ndarray:
+        """Severity codes (0 green, 1 yellow, 2 red) after overrides; `codes` defaults to all green."""
+        s = np.asarray(scores, dtype=float)
+        out = np.zeros(s.shape, dtype=np.int8) if codes is None else np.array(codes, dtype=np.int8)
+        for o in self.overrides:
+            cols = np.array([o.matches(n) for n in names], dtype=bool)
+            if cols.any():
+                out = np.where(cols & (s >= o.min_score) & (s <= o.max_score), np.int8(_CODES[o.severity]), out)
+        return out
+
+    @staticmethod
+    def risk_labels(codes) -> np.ndarray:
+        """High where any signal is red, else Elevated where any is yellow, else Moderate."""
+        c = np.asarray(codes)
+        return RISK_LABELS[c.max(axis=-1, initial=0)]
+
+    def fuse(self, signals: List[Signal], ages: Optional[Sequence[float]] = None) -> Tuple[float, str, List[Signal]]:
+        """(composite, risk label, signals with severity overrides applied) for one verdict."""
+        names = [s.name for s in signals]
+        scores = np.array([s.score for s in signals], dtype=float)
+        codes = self.severity_codes(scores, names, [_CODES.get(s.severity, 0) for s in signals])
+        if self.overrides:
+            signals = [s if s.severity == SEVERITIES[c] else replace(s, severity=SEVERITIES[c])
+                       for s, c in zip(signals, codes.tolist())]
+        return float(self.composite(scores, names, ages)), str(self.risk_labels(codes)), signals
+
+    def fuse_frame(self, scores, severities=None, ages=None):
+        """composite and risk_label columns for a (rows × signals) score DataFrame, e.g. dates × signals.
+
+        `severities` is an optional frame of severity strings or codes shaped like `scores`.
+        """
+        import pandas as pd
+        names = [str(c) for c in scores.columns]
+        values = scores.to_numpy(dtype=float)
+        base = None
+        if severities is not None:
+            sev = severities.to_numpy()
+            base = (sev == "yellow") + 2 * (sev == "red") if sev.dtype == object else sev
+        codes = self.severity_codes(values, names, base)
+        return pd.DataFrame({"composite": self.composite(values, names, ages), "risk_label": self.risk_labels(codes)},
+                            index=scores.index)
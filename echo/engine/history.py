@@ -0,0 +1,167 @@
+from __future__ import annotations
+import os, sqlite3, threading, time
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+from .echo_engine import Verdict
+
+# Rollup resolutions (seconds) maintained on every append; name_id 0 holds the composite.
+ROLLUPS = (3600, 86400)
+_COMPOSITE = 0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    ts REAL PRIMARY KEY,            -- epoch seconds (UTC)
+    asof TEXT,
+    composite REAL,
+    risk_label TEXT,
+    cap_efficiency REAL
+);
+CREATE TABLE IF NOT EXISTS signal_names (
+    id INTEGER PRIMARY KEY,         -- starts at 1; 0 is the composite in `rollups`
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signals (
+    name_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    score REAL,
+    severity TEXT,
+    PRIMARY KEY (name_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    name_id INTEGER NOT NULL,
+    res INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,        -- bucket start, epoch seconds
+    n INTEGER NOT NULL,
+    total REAL NOT NULL,
+    PRIMARY KEY (name_id, res, bucket)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = ("INSERT INTO rollups VALUES (?, ?, ?, 1, ?) "
+           "ON CONFLICT(name_id, res, bucket) DO UPDATE SET n = n + 1, total = total + excluded.total")
+
+class VerdictStore:
+    """Append-only SQLite history of verdicts and their signals.
+
+    Signals are clustered by (signal, time), so a range query for one signal reads one contiguous
+    slice of the table. Hourly/daily mean rollups are updated in the same transaction as each append,
+    so long windows (a year of minute snapshots) are served from a few thousand pre-aggregated rows.
+    WAL mode lets dashboards read while the daemon appends.
+    """
+    def __init__(self, path: str = "reports/verdicts.sqlite", raw_window_s: float = 7 * 86400,
+                 hourly_window_s: float = 180 * 86400):
+        self.path = path
+        self.raw_window_s = raw_window_s
+        self.hourly_window_s = hourly_window_s
+        self._local = threading.local()
+        self._names: Dict[str, int] = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, cfg: Dict) -> Optional["VerdictStore"]:
+        hcfg = cfg.get("history", {})
+        if not hcfg.get("enabled", False):
+            return None
+        return cls(hcfg.get("path", "reports/verdicts.sqlite"),
+                   raw_window_s=float(hcfg.get("raw_window_days", 7)) * 86400,
+                   hourly_window_s=float(hcfg.get("hourly_window_days", 180)) * 86400)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _name_id(self, conn: sqlite3.Connection, name: str) -> int:
+        nid = self._names.get(name)
+        if nid is None:
+            conn.execute("INSERT OR IGNORE INTO signal_names(name) VALUES (?)", (name,))
+            nid = conn.execute("SELECT id FROM signal_names WHERE name = ?", (name,)).fetchone()[0]
+            self._names[name] = nid
+        return nid
+
+    def append(self, verdict: Verdict, ts: Optional[float] = None) -> bool:
+        """Record `verdict` at `ts` (default now). Returns False if a verdict already exists at that timestamp."""
+        ts = ts if ts is not None else time.time()
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("INSERT OR IGNORE INTO verdicts VALUES (?, ?, ?, ?, ?)",
+                               (ts, verdict.asof, verdict.composite, verdict.risk_label, verdict.cap_efficiency))
+            if cur.rowcount == 0:
+                return False
+            scores = [(self._name_id(conn, s.name), s) for s in verdict.signals]
+            conn.executemany("INSERT OR REPLACE INTO signals VALUES (?, ?, ?, ?)",
+                             [(nid, ts, s.score, s.severity) for nid, s in scores])
+            conn.executemany(_UPSERT, [(nid, res, int(ts // res) * res, score) for res in ROLLUPS
+                                       for nid, score in [(_COMPOSITE, verdict.composite)] + [(n, s.score) for n, s in scores]])
+        return True
+
+    def signal_names(self) -> List[str]:
+        return [r[0] for r in self._conn().execute("SELECT name FROM signal_names ORDER BY name")]
+
+    def resolution(self, start: Optional[float], end: Optional[float]) -> int:
+        """0 (raw rows) for short windows, else the hourly or daily rollup."""
+        lo, hi = _bounds(start, end)
+        span = min(hi, time.time()) - lo
+        if span <= self.raw_window_s:
+            return 0
+        return ROLLUPS[0] if span <= self.hourly_window_s else ROLLUPS[1]
+
+    def verdict_history(self, start: Optional[float] = None, end: Optional[float] = None,
+                        res: Optional[int] = None) -> pd.DataFrame:
+        """composite / risk_label / cap_efficiency per snapshot (or mean composite per rollup bucket), UTC index."""
+        res = self.resolution(start, end) if res is None else res
+        if res:
+            return self._rollup([_COMPOSITE], ["composite"], res, start, end)
+        rows = self._conn().execute("SELECT ts, composite, risk_label, cap_efficiency FROM verdicts "
+                                    "WHERE ts >= ? AND ts <= ? ORDER BY ts", _bounds(start, end)).fetchall()
+        return _time_index(pd.DataFrame.from_records(rows, columns=["ts", "composite", "risk_label", "cap_efficiency"]))
+
+    def signal_history(self, names: Optional[Iterable[str]] = None, start: Optional[float] = None,
+                       end: Optional[float] = None, res: Optional[int] = None) -> pd.DataFrame:
+        """Signal scores over time, one column per signal name, UTC index."""
+        known = dict(self._conn().execute("SELECT name, id FROM signal_names").fetchall())
+        names = [n for n in (list(names) if names is not None else sorted(known)) if n in known]
+        if not names:
+            return pd.DataFrame()
+        res = self.resolution(start, end) if res is None else res
+        ids = [known[n] for n in names]
+        if res:
+            return self._rollup(ids, names, res, start, end)
+        lo, hi = _bounds(start, end)
+        rows = []
+        for nid in ids:
+            rows += self._conn().execute("SELECT name_id, ts, score FROM signals WHERE name_id = ? AND ts >= ? AND ts <= ?",
+                                         (nid, lo, hi)).fetchall()
+        return _pivot(rows, dict(zip(ids, names)))
+
+    def _rollup(self, ids: List[int], names: List[str], res: int, start, end) -> pd.DataFrame:
+        lo, hi = _bounds(start, end)
+        rows = []
+        for nid in ids:
+            rows += self._conn().execute("SELECT name_id, bucket, total / n FROM rollups "
+                                         "WHERE name_id = ? AND res = ? AND bucket >= ? AND bucket <= ?",
+                                         (nid, res, (lo // res) * res if lo > float("-inf") else lo, hi)).fetchall()
+        return _pivot(rows, dict(zip(ids, names)))
+
+def _pivot(rows: List, labels: Dict[int, str]) -> pd.DataFrame:
+    if not rows:
+        return pd.DataFrame(columns=list(labels.values()))
+    df = pd.DataFrame.from_records(rows, columns=["name_id", "ts", "score"])
+    df["name"] = df.pop("name_id").map(labels)
+    wide = df.pivot(index="ts", columns="name", values="score").reindex(columns=list(labels.values()))
+    return _time_index(wide.reset_index())
+
+def _bounds(start: Optional[float], end: Optional[float]):
+    return (start if start is not None else float("-inf"), end if end is not None else float("inf"))
+
+def _time_index(df: pd.DataFrame) -> pd.DataFrame:
+    df.index = pd.to_datetime(df.pop("ts"), unit="s", utc=True)
+    df.index.name = "time"
+    df.columns.name = None
+    return df
@@ -0,0 +1,276 @@
+from __future__ import annotations
+import json, math, os, threading, time
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+
+# Incremental per-ticker statistics: every new bar updates volatility, momentum and drawdown in O(1),
+# whatever the lookback, and the still-forming last bar can be revised in O(1) too. State checkpoints to
+# JSON so a restarted dashboard/daemon resumes from the last bar it saw instead of replaying history.
+# Definitions match risk_metrics: vol = sample std of the last N simple returns × √252, momentum =
+# last / close N bars ago − 1, rr = momentum / vol.
+
+TRADING_DAYS = 252
+
+class RollingVariance:
+    """Sample variance of the last `window` values (sliding-window Welford)."""
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._updates = 0
+
+    def add(self, x: float):
+        if len(self.values) == self.window:
+            self._swap(self.values[0], x)
+            self.values.append(x)
+        else:
+            self.values.append(x)
+            d = x - self.mean
+            self.mean += d / len(self.values)
+            self.m2 += d * (x - self.mean)
+        self._tick()
+
+    def replace_last(self, x: float):
+        old = self.values[-1]
+        self.values[-1] = x
+        self._swap(old, x)
+        self._tick()
+
+    def _swap(self, old: float, new: float):
+        n, mean0 = len(self.values), self.mean
+        self.mean += (new - old) / n
+        self.m2 += (new - old) * (new - self.mean + old - mean0)
+
+    def _tick(self):
+        # Re-anchor on the exact window now and then so floating-point drift can't accumulate.
+        self._updates += 1
+        if self._updates >= 4 * self.window:
+            self._updates = 0
+            vals = np.fromiter(self.values, dtype=float)
+            self.mean = float(vals.mean())
+            self.m2 = float(((vals - self.mean) ** 2).sum())
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def variance(self) -> float:
+        return max(self.m2, 0.0) / (len(self.values) - 1) if len(self.values) >= 2 else math.nan
+
+class RollingMomentum:
+    """last / first − 1 over the last `window` + 1 closes."""
+    def __init__(self, window: int):
+        self.window = window
+        self.closes: deque = deque(maxlen=window + 1)
+
+    def add(self, close: float):
+        self.closes.append(close)
+
+    def replace_last(self, close: float):
+        self.closes[-1] = close
+
+    @property
+    def value(self) -> float:
+        return self.closes[-1] / self.closes[0] - 1.0 if len(self.closes) == self.window + 1 else math.nan
+
+class RunningDrawdown:
+    """Peak, current and maximum drawdown since the first close."""
+    def __init__(self):
+        self.peak = -math.inf
+        self.max_drawdown = 0.0
+        self.last = math.nan
+        self._before_last = (self.peak, self.max_drawdown)
+
+    def add(self, close: float):
+        self._before_last = (self.peak, self.max_drawdown)
+        self._apply(close)
+
+    def replace_last(self, close: float):
+        self.peak, self.max_drawdown = self._before_last
+        self._apply(close)
+
+    def _apply(self, close: float):
+        self.last = close
+        self.peak = max(self.peak, close)
+        self.max_drawdown = min(self.max_drawdown, close / self.peak - 1.0)
+
+    @property
+    def drawdown(self) -> float:
+        return self.last / self.peak - 1.0 if self.peak > 0 else math.nan
+
+class TickerStats:
+    def __init__(self, vol_windows: Iterable[int] = (20,), mom_window: int = 20):
+        self.vols = {int(w): RollingVariance(int(w)) for w in vol_windows}
+        self.momentum = RollingMomentum(mom_window)
+        self.drawdown = RunningDrawdown()
+        self.bars = 0
+        self.last_ts: Optional[int] = None  # UTC ns of the last bar
+        self.last = math.nan
+        self.prev = math.nan                 # close before the last bar
+
+    def update(self, ts: int, close: float) -> bool:
+        """Apply a bar; a bar with the last bar's timestamp revises it, older bars are ignored."""
+        if close != close or (self.last_ts is not None and ts < self.last_ts):
+            return False
+        if ts == self.last_ts:
+            if close == self.last:
+                return False
+            self.last = close
+            if self.prev == self.prev:
+                r = close / self.prev - 1.0
+                for v in self.vols.values():
+                    v.replace_last(r)
+            self.momentum.replace_last(close)
+            self.drawdown.replace_last(close)
+            return True
+        if self.last == self.last:
+            r = close / self.last - 1.0
+            for v in self.vols.values():
+                v.add(r)
+        self.prev, self.last, self.last_ts = self.last, close, ts
+        self.bars += 1
+        self.momentum.add(close)
+        self.drawdown.add(close)
+        return True
+
+    def ann_vol(self, window: int) -> Optional[float]:
+        """Annualized vol over `window` returns; None if that window isn't tracked, NaN until it is full."""
+        v = self.vols.get(window)
+        if v is None:
+            return None
+        return math.sqrt(v.variance) * math.sqrt(TRADING_DAYS) if len(v) == window else math.nan
+
+    def rr(self, vol_window: int) -> Tuple[float, float, float]:
+        """(momentum, ann vol, momentum / vol) as fractions; NaN where history is too short."""
+        mom, vol = self.momentum.value, self.ann_vol(vol_window)
+        vol = math.nan if vol is None else vol
+        return mom, vol, (mom / vol if vol > 0 else math.nan)
+
+    def to_dict(self) -> Dict:
+        return {"bars": self.bars, "last_ts": self.last_ts, "last": self.last, "prev": self.prev,
+                "vols": {str(w): {"values": list(v.values), "mean": v.mean, "m2": v.m2} for w, v in self.vols.items()},
+                "momentum": list(self.momentum.closes),
+                "drawdown": [self.drawdown.peak, self.drawdown.max_drawdown, self.drawdown.last,
+                             *self.drawdown._before_last]}
+
+    @classmethod
+    def from_dict(cls, d: Dict, mom_window: int) -> "TickerStats":
+        s = cls([int(w) for w in d["vols"]], mom_window)
+        s.bars, s.last_ts, s.last, s.prev = d["bars"], d["last_ts"], d["last"], d["prev"]
+        for w, v in d["vols"].items():
+            rv = s.vols[int(w)]
+            rv.values.extend(v["values"])
+            rv.mean, rv.m2 = v["mean"], v["m2"]
+        s.momentum.closes.extend(d["momentum"])
+        dd = s.drawdown
+        dd.peak, dd.max_drawdown, dd.last = d["drawdown"][:3]
+        dd._before_last = tuple(d["drawdown"][3:])
+        return s
+
+class OnlineStatsBook:
+    """TickerStats for every ticker a BarStream carries, fed from its windows (only bars past each ticker's
+    last processed timestamp) and checkpointed to `path` at most every `checkpoint_s` seconds."""
+    def __init__(self, vol_windows: Iterable[int] = (20, 21), mom_window: int = 20, path: Optional[str] = None,
+                 checkpoint_s: float = 60.0, interval: str = "1d"):
+        self.vol_windows = tuple(sorted({int(w) for w in vol_windows}))
+        self.mom_window = int(mom_window)
+        self.interval = interval  # bar interval fed in; windows count these bars
+        self.path = path
+        self.checkpoint_s = checkpoint_s
+        self._stats: Dict[str, TickerStats] = {}
+        self._lock = threading.RLock()
+        self._saved_at = 0.0
+
+    @classmethod
+    def from_config(cls, cfg: Dict) -> "OnlineStatsBook":
+        ocfg = cfg.get("online_stats", {}) or {}
+        book = cls(ocfg.get("vol_windows", (20, 21)), ocfg.get("mom_window", 20), ocfg.get("checkpoint_path"),
+                   float(ocfg.get("checkpoint_seconds", 60)), (cfg.get("streaming", {}) or {}).get("interval", "1d"))
+        if book.path:
+            book.load()
+        return book
+
+    def get(self, ticker: str) -> Optional[TickerStats]:
+        return self._stats.get(ticker)
+
+    def update(self, ticker: str, ts: int, close: float) -> bool:
+        with self._lock:
+            s = self._stats.get(ticker)
+            if s is None:
+                s = self._stats[ticker] = TickerStats(self.vol_windows, self.mom_window)
+            return s.update(ts, close)
+
+    def feed(self, ticker: str, ts: np.ndarray, closes: np.ndarray):
+        """Apply a ticker's bar history (UTC ns, close; time order), skipping bars already processed. O(new bars)
+        when the last processed bar is in `ts`; otherwise (a gap, e.g. an old checkpoint) the stats restart."""
+        if not len(ts):
+            return
+        with self._lock:
+            s = self._stats.get(ticker)
+            if s is not None and s.last_ts is not None:
+                i = int(np.searchsorted(ts, s.last_ts))
+                if i < len(ts) and ts[i] == s.last_ts:
+                    ts, closes = ts[i:], closes[i:]
+                elif i < len(ts):
+                    del self._stats[ticker]
+                else:
+                    return
+            for t, c in zip(ts.tolist(), closes.tolist()):
+                self.update(ticker, t, c)
+
+    def attach(self, stream):
+        """Keep the book current with `stream` (call before seeding it) and checkpoint as bars arrive."""
+        def on_bars(ticker, window):
+            self.feed(ticker, *window.arrays())
+            self.maybe_save()
+        self.interval = stream.interval
+        stream.subscribe(on_bars)
+
+    def measures(self, interval: str, vol_window: int, mom_window: Optional[int] = None) -> bool:
+        """Whether the book's numbers mean the same as a computation on `interval` bars with these windows (e.g.
+        daily bars and 20/20 for the R:R heatmap); √252 annualization only holds for daily bars."""
+        return (self.interval == interval == "1d" and vol_window in self.vol_windows
+                and (mom_window is None or mom_window == self.mom_window))
+
+    def rr(self, ticker: str, vol_window: int = 20) -> Optional[Tuple[float, float, float]]:
+        """(momentum, vol, rr) once the ticker has enough bars for both windows, else None."""
+        s = self._stats.get(ticker)
+        if s is None or vol_window not in s.vols or s.bars <= max(self.mom_window, vol_window):
+            return None
+        return s.rr(vol_window)
+
+    def covers(self, tickers: Iterable[str], vol_window: int = 20) -> bool:
+        return all(self.rr(t, vol_window) is not None for t in tickers)
+
+    def maybe_save(self):
+        if self.path and time.time() - self._saved_at >= self.checkpoint_s:
+            self.save()
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        with self._lock:
+            payload = {"vol_windows": list(self.vol_windows), "mom_window": self.mom_window, "interval": self.interval,
+                       "tickers": {t: s.to_dict() for t, s in self._stats.items()}}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+        self._saved_at = time.time()
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """Restore a checkpoint written with the same windows and interval; returns False if there is none to use."""
+        path = path or self.path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False
+        if (tuple(payload.get("vol_windows", ())) != self.vol_windows or payload.get("mom_window") != self.mom_window
+                or payload.get("interval", "1d") != self.interval):
+            return False
+        with self._lock:
+            self._stats = {t: TickerStats.from_dict(d, self.mom_window) for t, d in payload["tickers"].items()}
+        return True
@@ -0,0 +1,80 @@
+from __future__ import annotations
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from . import risk_metrics
+
+# Pure panel math shared by the Streamlit apps (and the benchmark suite); no Streamlit imports here.
+# The numbers themselves come from risk_metrics; this module only shapes them into table rows.
+
+def rr_band(rr: float, rr_cfg: Dict) -> str:
+    color = "gray"
+    if rr == rr:
+        if rr >= rr_cfg.get("green_min", 1.5):
+            color = "green"
+        elif rr >= rr_cfg.get("yellow_min", 1.0):
+            color = "yellow"
+        elif rr < rr_cfg.get("red_max", 1.0):
+            color = "red"
+    return color
+
+def stale_tickers(frames: Dict[str, pd.DataFrame]) -> List[str]:
+    """Tickers served from last-known bars because the provider could not refresh them."""
+    return [t for t, df in frames.items() if df is not None and df.attrs.get("stale")]
+
+RR_WINDOW = 20  # daily bars for the heatmap's momentum and vol (risk_metrics.compute defaults)
+
+def rr_online(online):
+    """`online` (an OnlineStatsBook) if its numbers can stand in for the heatmap's daily 20/20 metrics, else None."""
+    return online if online is not None and online.measures("1d", RR_WINDOW, mom_window=RR_WINDOW) else None
+
+def rr_rows(slots: Dict[str, str], frames: Dict[str, pd.DataFrame], rr_cfg: Dict, online=None) -> List[Dict]:
+    """Rows for the Risk/Reward Heatmap table, one per slot with data. Tickers an OnlineStatsBook (`online`)
+    already tracks are read from it in O(1) when it uses the same bars and windows; the rest are computed from
+    `frames`."""
+    stats = {}
+    online = rr_online(online)
+    if online is not None:
+        stats = {tk: v for tk in slots.values() if (v := online.rr(tk, RR_WINDOW)) is not None}
+    rest = {tk: frames.get(tk) for tk in slots.values() if tk not in stats}
+    if rest:
+        m = risk_metrics.compute(risk_metrics.close_matrix(rest), mom_window=RR_WINDOW, vol_window=RR_WINDOW)
+        stats.update(zip(m.index, zip(m["momentum"].tolist(), m["vol"].tolist(), m["rr"].tolist())))
+    rows = []
+    for label, tk in slots.items():
+        if tk not in stats:
+            continue
+        mom20, vol20, rr = stats[tk]
+        rows.append({"Slot": label.capitalize(), "Ticker": tk, "Momentum(20d)%": round(mom20*100,2) if mom20==mom20 else None,
+                     "Vol(ann%)": round(vol20*100,1) if vol20==vol20 else None, "R:R": round(rr,2) if rr==rr else None,
+                     "Band": rr_band(rr, rr_cfg),
+                     "Suggested Stop": f"{rr_cfg.get('stop_pct',5)}%",
+                     "Suggested Target": f"{rr_cfg.get('target_pct',10)}%"})
+    return rows
+
+def sector_flow_rows(sector_etfs: Dict[str, str], frames: Dict[str, pd.DataFrame], days: int = 5) -> List[Dict]:
+    """Rows for the Sector Flow Scanner, sorted by `days`-day change, strongest first."""
+    m = risk_metrics.compute(risk_metrics.close_matrix({etf: frames.get(etf) for etf in sector_etfs.values()}),
+                             mom_window=days)
+    momentum = dict(zip(m.index, m["momentum"].tolist()))
+    flows = []
+    for name, etf in sector_etfs.items():
+        chg = momentum.get(etf, np.nan)
+        if chg == chg:
+            flows.append({"Sector": name, "ETF": etf, f"{days}d %": round(float(chg) * 100, 2)})
+    return sorted(flows, key=lambda r: r[f"{days}d %"], reverse=True)
+
+def position_table(portfolio, marks) -> pd.DataFrame:
+    """Positions P&L table (one row per position) for a Portfolio marked with `marks`."""
+    idx = portfolio.ticker_idx
+    return pd.DataFrame({
+        "Account": np.asarray(portfolio.accounts, dtype=object)[portfolio.account_idx],
+        "Slot": np.asarray(portfolio.slots, dtype=object)[portfolio.slot_idx],
+        "Ticker": np.asarray(portfolio.tickers, dtype=object)[idx],
+        "Shares": portfolio.shares,
+        "Cost": portfolio.cost,
+        "Price": marks.price,
+        "Market Value": marks.market_value,
+        "Unrealized P&L": marks.unrealized_pnl,
+        "P&L %": marks.unrealized_pct * 100.0,
+    })
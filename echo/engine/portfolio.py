@@ -1,17 +1,161 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Dict
+import csv
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
+
+# Holdings as parallel arrays (one row per position, any number of accounts) so mark-to-market, P&L,
+# slot exposure and cash-buffer checks are a few NumPy ops per refresh however many positions there are.
+
+DEFAULT_ACCOUNT = "main"
 
 @dataclass
 class Position:
     ticker: str
     shares: float = 0.0
-    cost_basis: float = 0.0
+    cost_basis: float = 0.0          # average cost per share
+    slot: str = ""                   # core | momentum | wildcard ("" = unslotted)
+    account: str = DEFAULT_ACCOUNT
 
 @dataclass
+class Marks:
+    """Portfolio marked at one set of prices; per-position arrays follow `Portfolio` row order."""
+    price: np.ndarray                # NaN where no price was available
+    market_value: np.ndarray
+    unrealized_pnl: np.ndarray
+    unrealized_pct: np.ndarray
+    account_cash: np.ndarray         # per account (Portfolio.accounts order)
+    account_value: np.ndarray        # cash + positions at market
+    account_pnl: np.ndarray
+
+def _codes(values: Iterable[str], known: Sequence[str] = ()) -> Tuple[List[str], np.ndarray]:
+    index = {v: i for i, v in enumerate(known)}
+    codes = [index.setdefault(v, len(index)) for v in values]
+    return list(index), np.asarray(codes, dtype=np.intp)
+
 class Portfolio:
-    slots: Dict[str, Position] = field(default_factory=dict)
-    cash_usd: float = 0.0
+    __slots__ = ("tickers", "accounts", "slots", "ticker_idx", "account_idx", "slot_idx", "shares", "cost", "cash",
+                 "_matrices")
+
+    def __init__(self, positions: Sequence[Position] = (), cash_usd: Union[float, Mapping[str, float]] = 0.0):
+        cash_map = dict(cash_usd) if isinstance(cash_usd, Mapping) else {DEFAULT_ACCOUNT: float(cash_usd)}
+        self.tickers, self.ticker_idx = _codes(p.ticker for p in positions)
+        self.accounts, self.account_idx = _codes((p.account for p in positions), known=list(cash_map))
+        self.slots, self.slot_idx = _codes(p.slot for p in positions)
+        self.shares = np.array([p.shares for p in positions], dtype=float)
+        self.cost = np.array([p.cost_basis for p in positions], dtype=float)
+        self.cash = np.array([float(cash_map.get(a, 0.0)) for a in self.accounts], dtype=float)
+        self._matrices = None
+
     @classmethod
-    def from_config(cls, slots_cfg: Dict[str, str]):
-        return cls(slots={k: Position(ticker=v) for k,v in slots_cfg.items()})
+    def from_config(cls, cfg: Dict) -> "Portfolio":
+        """Holdings from a full config's `portfolio:` section (inline `positions` plus `positions_file`); without
+        any, one empty position per `slots:` entry."""
+        slots = cfg["slots"]
+        slot_of = {t: k for k, t in slots.items()}
+        pcfg = cfg.get("portfolio", {}) or {}
+        rows = list(pcfg.get("positions", []) or [])
+        if pcfg.get("positions_file"):
+            rows += load_positions(pcfg["positions_file"])
+        if not rows:
+            return cls([Position(ticker=t, slot=k) for k, t in slots.items()], pcfg.get("cash_usd", 0.0))
+        positions = [Position(ticker=r["ticker"], shares=float(r.get("shares") or 0), cost_basis=float(r.get("cost_basis") or 0),
+                              slot=r.get("slot") or slot_of.get(r["ticker"], ""), account=r.get("account") or DEFAULT_ACCOUNT)
+                     for r in rows]
+        return cls(positions, pcfg.get("cash_usd", 0.0))
+
+    def __len__(self) -> int:
+        return len(self.shares)
+
+    @property
+    def cash_usd(self) -> float:
+        return float(self.cash.sum())
+
+    def positions(self) -> List[Position]:
+        return [Position(self.tickers[t], float(s), float(c), self.slots[k], self.accounts[a])
+                for t, s, c, k, a in zip(self.ticker_idx, self.shares, self.cost, self.slot_idx, self.account_idx)]
+
+    def price_vector(self, prices: Mapping[str, Union[float, Dict, None]]) -> np.ndarray:
+        """Prices aligned with `tickers` from a ticker -> price (or quote dict) mapping; NaN where missing."""
+        def px(v):
+            v = v.get("price") if isinstance(v, dict) else v
+            return np.nan if v is None else float(v)
+        return np.array([px(prices.get(t)) for t in self.tickers], dtype=float)
+
+    def mark(self, prices: Union[np.ndarray, Mapping]) -> Marks:
+        """Mark every position at `prices` (a `price_vector` or a mapping); unpriced positions count at cost."""
+        upx = prices if isinstance(prices, np.ndarray) else self.price_vector(prices)
+        price = upx[self.ticker_idx] if len(self.tickers) else np.empty(0)
+        cost_value = self.shares * self.cost
+        mv = np.where(np.isnan(price), cost_value, self.shares * price)
+        pnl = mv - cost_value
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = np.where(cost_value != 0, pnl / np.abs(cost_value), np.nan)
+        n = len(self.accounts)
+        value = self.cash + np.bincount(self.account_idx, weights=mv, minlength=n)
+        return Marks(price, mv, pnl, pct, self.cash.copy(), value, np.bincount(self.account_idx, weights=pnl, minlength=n))
+
+    def slot_exposure(self, marks: Marks, stop_pct: float = 5.0, max_slot_risk_usd: Optional[float] = None):
+        """Per (account, slot): market value and the loss if every position hit a `stop_pct` stop, against
+        `risk.max_slot_risk_usd`. Unslotted positions are left out."""
+        import pandas as pd
+        ns = len(self.slots)
+        keys = self.account_idx * ns + self.slot_idx
+        mv = np.bincount(keys, weights=marks.market_value, minlength=len(self.accounts) * ns)
+        risk = np.abs(mv) * stop_pct / 100.0
+        acct, slot = np.divmod(np.arange(len(mv)), max(ns, 1))
+        held = np.bincount(keys, minlength=len(mv)) > 0
+        out = pd.DataFrame({"account": np.asarray(self.accounts, dtype=object)[acct[held]],
+                            "slot": np.asarray(self.slots, dtype=object)[slot[held]],
+                            "market_value": mv[held], "risk_usd": risk[held]})
+        out = out[out["slot"] != ""].reset_index(drop=True)
+        out["limit_usd"] = max_slot_risk_usd
+        out["breach"] = (out["risk_usd"] > max_slot_risk_usd) if max_slot_risk_usd is not None else False
+        return out
+
+    def cash_buffer(self, marks: Marks, min_pct: float):
+        """Per account: cash as % of account value against `risk.cash_buffer_percent`."""
+        import pandas as pd
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = np.where(marks.account_value > 0, marks.account_cash / marks.account_value * 100.0, np.nan)
+        return pd.DataFrame({"account": self.accounts, "cash_usd": marks.account_cash, "value_usd": marks.account_value,
+                             "cash_pct": pct, "min_pct": min_pct, "breach": pct < min_pct})
+
+    def holdings(self) -> np.ndarray:
+        """Shares as a (tickers × accounts) matrix."""
+        return self._aggregates()[0]
+
+    def _aggregates(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._matrices is None:
+            shape = (len(self.tickers), len(self.accounts))
+            h, basis = np.zeros(shape), np.zeros(shape)
+            np.add.at(h, (self.ticker_idx, self.account_idx), self.shares)
+            np.add.at(basis, (self.ticker_idx, self.account_idx), self.shares * self.cost)
+            self._matrices = (h, basis)
+        return self._matrices
+
+    def account_values(self, px: np.ndarray) -> np.ndarray:
+        """Account values (cash + holdings) for prices aligned with `tickers`, one row per price row; NaN prices
+        count at cost."""
+        h, basis = self._aggregates()
+        missing = np.isnan(px)
+        return np.where(missing, 0.0, px) @ h + missing.astype(float) @ basis + self.cash
+
+    def equity_curve(self, closes):
+        """Account value at each close of a dates × tickers close matrix (NaN closes carried forward); one
+        matrix product."""
+        import pandas as pd
+        px = closes.reindex(columns=self.tickers).ffill().to_numpy(dtype=float)
+        return pd.DataFrame(self.account_values(px), index=closes.index, columns=self.accounts)
+
+def load_positions(path: str) -> List[Dict]:
+    """Rows from a CSV with ticker, shares, cost_basis and optional slot / account columns."""
+    with open(path, "r", newline="") as f:
+        return [dict(r) for r in csv.DictReader(f)]
+
+def risk_checks(portfolio: Portfolio, marks: Marks, cfg: Dict):
+    """(slot exposure, cash buffer) frames using `risk.*` limits and the R:R heatmap stop."""
+    risk = cfg.get("risk", {})
+    exposure = portfolio.slot_exposure(marks, stop_pct=float(cfg.get("rr_heatmap", {}).get("stop_pct", 5)),
+                                       max_slot_risk_usd=risk.get("max_slot_risk_usd"))
+    return exposure, portfolio.cash_buffer(marks, float(risk.get("cash_buffer_percent", 0)))
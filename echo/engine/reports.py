@@ -2,6 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Dict
 from .echo_engine import Verdict
+from ..utils.timing import span
 
 @dataclass
 class Report:
@@ -13,6 +14,11 @@ class Report:
     allocations: Dict[str,str]
 
 def format_daily(verdict: Verdict) -> str:
+    # Timed under the caller's active tracer; `verdict.trace` is never touched (verdicts may be shared).
+    with span("report.format_daily"):
+        return _format_daily(verdict)
+
+def _format_daily(verdict: Verdict) -> str:
     lines = []
     lines.append(f"As of {verdict.asof}")
     lines.append("")
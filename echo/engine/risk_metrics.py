@@ -0,0 +1,101 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+# Single source of momentum / volatility / Sharpe / drawdown numbers for the dashboards, rules and scanner.
+# Everything is computed column-wise over a close matrix (dates × tickers) in one NumPy pass. Tickers with
+# shorter or gappy histories are handled by right-aligning each column's valid closes first, so every
+# ticker's window is "its last N bars", exactly as a per-series pandas computation would see it.
+
+TRADING_DAYS = 252
+COLUMNS = ["last", "bars", "momentum", "vol", "rr", "total_return", "ann_vol", "sharpe", "max_drawdown"]
+
+_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 256
+
+def close_matrix(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Close matrix from `history_many` output, skipping tickers without data."""
+    cols = {t: df["Close"] for t, df in frames.items() if df is not None and not df.empty and "Close" in df}
+    if not cols:
+        return pd.DataFrame()
+    first = next(iter(cols.values())).index
+    if all(c.index.equals(first) for c in cols.values()):  # common case: one batched load, one calendar
+        return pd.DataFrame(np.column_stack([c.to_numpy(dtype=float) for c in cols.values()]),
+                            index=first, columns=list(cols)).sort_index()
+    return pd.DataFrame(cols).sort_index()
+
+def compute(closes: pd.DataFrame, mom_window: int = 20, vol_window: int = 20, cache: bool = True) -> pd.DataFrame:
+    """Risk metrics per ticker (rows) for a close matrix (dates × tickers); all values are fractions.
+
+    momentum/vol/rr use the last `mom_window` bars and `vol_window` returns; total_return, ann_vol, sharpe
+    and max_drawdown cover the whole matrix. Metrics a ticker has too little history for are NaN.
+    Results are memoized by (tickers, last bar date and closes, length, windows).
+    """
+    if closes.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    key = None
+    if cache:
+        key = (tuple(closes.columns), closes.index[-1], len(closes), closes.iloc[-1].to_numpy(dtype=float).tobytes(),
+               mom_window, vol_window)
+        with _cache_lock:
+            hit = _cache.get(key)
+            if hit is not None:
+                _cache.move_to_end(key)
+                return hit.copy()
+    out = pd.DataFrame(_metrics(closes.to_numpy(dtype=float), mom_window, vol_window), index=closes.columns)[COLUMNS]
+    if key is not None:
+        with _cache_lock:
+            _cache[key] = out
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+        return out.copy()
+    return out
+
+def series_metrics(close: pd.Series, **kw) -> pd.Series:
+    """`compute` for a single close series."""
+    return compute(close.to_frame("x"), **kw).loc["x"]
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+def _metrics(px: np.ndarray, mom_window: int, vol_window: int) -> Dict[str, np.ndarray]:
+    if px.ndim == 1:
+        px = px[:, None]
+    valid = ~np.isnan(px)
+    n = valid.sum(axis=0)
+    # Right-align: each column's valid closes end on the last row, NaN padding on top.
+    order = np.argsort(valid, axis=0, kind="stable")
+    p = np.take_along_axis(px, order, axis=0)
+    rows, cols = p.shape
+    col = np.arange(cols)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        last = p[-1]
+        ret = p[1:] / p[:-1] - 1.0
+        base = p[-mom_window - 1] if rows > mom_window else np.full(cols, np.nan)
+        momentum = np.where(n > mom_window, last / base - 1.0, np.nan)
+        tail = ret[-vol_window:]
+        vol = np.where(n > vol_window, _nanstd(tail) * np.sqrt(TRADING_DAYS), np.nan)
+        rr = np.where(vol > 0, momentum / vol, np.nan)
+
+        first = p[np.clip(rows - n, 0, rows - 1), col]
+        total_return = np.where(n > 0, last / first - 1.0, np.nan)
+        sd = _nanstd(ret)
+        ann_vol = sd * np.sqrt(TRADING_DAYS)
+        mean = np.nansum(ret, axis=0) / np.maximum(n - 1, 1)
+        sharpe = np.where(sd > 0, mean * TRADING_DAYS / ann_vol, np.nan)
+        peak = np.fmax.accumulate(p, axis=0)
+        dd = p / peak - 1.0
+        max_drawdown = np.where(n > 0, np.nanmin(np.where(np.isnan(dd), np.inf, dd), axis=0), np.nan)
+    return {"last": last, "bars": n, "momentum": momentum, "vol": vol, "rr": rr, "total_return": total_return,
+            "ann_vol": ann_vol, "sharpe": sharpe, "max_drawdown": max_drawdown}
+
+def _nanstd(x: np.ndarray) -> np.ndarray:
+    """Column-wise sample std (ddof=1) ignoring NaN; NaN where fewer than two values."""
+    k = np.sum(~np.isnan(x), axis=0)
+    dev = x - np.nansum(x, axis=0) / np.maximum(k, 1)
+    return np.where(k >= 2, np.sqrt(np.nansum(dev * dev, axis=0) / np.maximum(k - 1, 1)), np.nan)
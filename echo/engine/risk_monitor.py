@@ -0,0 +1,82 @@
+from __future__ import annotations
+from typing import Optional
+import numpy as np
+from .portfolio import Portfolio
+
+# Rolling per-account equity curve for the kill switch. Each new daily bar adds one row of account values
+# (one matrix product over all positions) and updates peak / max drawdown in O(accounts); only when a bar
+# falls out of the window is the (window × accounts) curve rescanned, with one vectorized pass.
+
+DAY_NS = 86_400 * 10**9
+
+class DrawdownMonitor:
+    """Equity curve and max drawdown per account over the last `window_days` calendar days of bars."""
+    def __init__(self, portfolio: Portfolio, window_days: float = 30):
+        self.portfolio = portfolio
+        self.window_ns = int(window_days * DAY_NS)
+        n = len(portfolio.accounts)
+        self.ts = np.empty(0, dtype=np.int64)      # bar timestamps (ns), oldest first
+        self.equity = np.empty((0, n))             # bars × accounts
+        self.peak = np.full(n, np.nan)
+        self.max_drawdown = np.zeros(n)            # fractions, <= 0
+        self.last_prices = np.full(len(portfolio.tickers), np.nan)  # closes at the last bar, carried forward
+        self._prev_prices = self.last_prices       # ... as of the bar before, for revising the last bar
+
+    def update(self, ts: int, closes: np.ndarray) -> bool:
+        """Apply one bar of closes aligned with `portfolio.tickers` (NaN = no new close); a bar with the last
+        bar's timestamp revises it, older bars are ignored."""
+        if self.ts.size and ts < self.ts[-1]:
+            return False
+        if self.ts.size and ts == self.ts[-1]:
+            self.last_prices = np.where(np.isnan(closes), self._prev_prices, closes)
+            self.equity[-1] = self.portfolio.account_values(self.last_prices)
+            self._rescan()
+            return True
+        px = np.where(np.isnan(closes), self.last_prices, closes)
+        self._prev_prices, self.last_prices = self.last_prices, px
+        value = self.portfolio.account_values(px)
+        self.ts = np.append(self.ts, ts)
+        self.equity = np.vstack([self.equity, value])
+        if self.ts[0] < ts - self.window_ns:
+            keep = self.ts >= ts - self.window_ns
+            self.ts, self.equity = self.ts[keep], self.equity[keep]
+            self._rescan()
+        else:
+            self.peak = np.fmax(self.peak, value)
+            self.max_drawdown = np.minimum(self.max_drawdown, _drawdown(value, self.peak))
+        return True
+
+    def feed(self, closes) -> int:
+        """Apply the rows of a dates × tickers close frame not processed yet (the last processed row is revised);
+        rows older than the window are only used to carry prices forward. Returns the rows applied."""
+        if closes is None or closes.empty:
+            return 0
+        import pandas as pd
+        ts = pd.DatetimeIndex(closes.index).as_unit("ns").asi8
+        px = closes.reindex(columns=self.portfolio.tickers).ffill().to_numpy(dtype=float)
+        start = int(np.searchsorted(ts, max(self.ts[-1] if self.ts.size else ts[0], ts[-1] - self.window_ns)))
+        if start > 0 and not self.ts.size:
+            self.last_prices = px[start - 1]
+        for t, row in zip(ts[start:].tolist(), px[start:]):
+            self.update(t, row)
+        return len(ts) - start
+
+    def _rescan(self):
+        peaks = np.fmax.accumulate(self.equity, axis=0)
+        self.peak = peaks[-1]
+        self.max_drawdown = np.minimum(_drawdown(self.equity, peaks).min(axis=0), 0.0)
+
+    @property
+    def drawdown(self) -> np.ndarray:
+        """Current drawdown from the window peak per account (fractions)."""
+        if not self.ts.size:
+            return np.zeros(len(self.portfolio.accounts))
+        return _drawdown(self.equity[-1], self.peak)
+
+    def worst(self) -> Optional[int]:
+        """Index (into `portfolio.accounts`) of the account with the deepest max drawdown."""
+        return int(np.argmin(self.max_drawdown)) if self.max_drawdown.size else None
+
+def _drawdown(value: np.ndarray, peak: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(peak > 0, value / peak - 1.0, 0.0)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+import csv, os
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from ..rules.pead import PEAD
+from ..rules.volatility_regime import VolatilityRegime
+from ..utils.calendar_index import CalendarIndex
+from ..utils.dates import now_tz
+from ..utils.logging import get_logger
+from ..utils.timing import span
+from . import risk_metrics
+from .backtest import load_closes
+from .panels import rr_band
+
+log = get_logger("EchoScanner")
+
+def load_universe(path: str) -> List[str]:
+    """Tickers from a text file (one per line, `#` comments) or a CSV with a ticker/symbol column."""
+    with open(path, "r", newline="") as f:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            rows = list(csv.DictReader(f))
+            col = next((c for c in (rows[0].keys() if rows else []) if c.strip().lower() in ("ticker", "symbol")), None)
+            if col is None:
+                raise ValueError(f"{path}: expected a 'ticker' or 'symbol' column")
+            tickers = [r[col] for r in rows]
+        else:
+            tickers = [line.split("#", 1)[0] for line in f]
+    return list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+
+def load_universe_closes(provider, tickers: Iterable[str], period: str = "3mo", chunk_size: int = 100) -> pd.DataFrame:
+    """Close matrix for the universe, one batched provider call per chunk; failed chunks are logged and skipped."""
+    tickers = list(tickers)
+    parts = []
+    for i in range(0, len(tickers), chunk_size):
+        chunk = tickers[i:i + chunk_size]
+        with span("scanner.load_chunk", tickers=len(chunk)):
+            try:
+                parts.append(load_closes(provider, chunk, period=period))
+            except Exception as e:
+                log.warning(f"Universe chunk {i}-{i + len(chunk)} failed: {e}")
+    return pd.concat(parts, axis=1).sort_index() if parts else pd.DataFrame()
+
+def scan(context: Dict, closes: pd.DataFrame, vol_window: int = 21, mom_window: int = 20) -> pd.DataFrame:
+    """Rank every column of `closes` by the slot-agnostic rules (VolatilityRegime, PEAD) plus 20d R:R.
+
+    Volatility and momentum come from one risk_metrics pass over the whole price matrix; PEAD is a
+    calendar lookup per ticker.
+    """
+    cfg = context["config"]
+    if closes.empty:
+        return pd.DataFrame()
+    m = risk_metrics.compute(closes, mom_window=mom_window, vol_window=vol_window)
+    last, mom, vol, rr = (m[c].to_numpy(dtype=float) for c in ("last", "momentum", "vol", "rr"))
+    mom, vol = mom * 100, vol * 100
+    vol_score = VolatilityRegime.scores(vol)
+
+    context = {**context, "calendar": CalendarIndex.of(context)}
+    pead = [PEAD.signal_for(context, t) for t in closes.columns]
+    pead_score = np.array([s.score for s in pead], dtype=float)
+
+    rr_cfg = cfg.get("rr_heatmap", {})
+    out = pd.DataFrame({
+        "Ticker": closes.columns,
+        "Last": np.round(last, 2),
+        "Momentum(20d)%": np.round(mom, 2),
+        "Vol(ann%)": np.round(vol, 1),
+        "R:R": np.round(rr, 2),
+        "Band": [rr_band(x, rr_cfg) for x in rr],
+        "Vol Regime": vol_score,
+        "PEAD": pead_score,
+        "PEAD Detail": [s.detail for s in pead],
+        "Score": (vol_score + pead_score) / 2,
+    })
+    out = out.sort_values(["Score", "R:R"], ascending=False, na_position="last").reset_index(drop=True)
+    out.index += 1
+    out.index.name = "Rank"
+    return out
+
+def run_scan(eng, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+    sc = eng.config.get("scanner", {})
+    tickers = tickers if tickers is not None else load_universe(sc.get("universe_file", "data/universe.txt"))
+    with span("scanner.run", tickers=len(tickers)):
+        closes = load_universe_closes(eng.provider, tickers, period=sc.get("period", "3mo"),
+                                      chunk_size=int(sc.get("chunk_size", 100)))
+        missing = len(tickers) - closes.shape[1]
+        if missing:
+            log.warning(f"No price data for {missing} of {len(tickers)} tickers")
+        return scan(eng._context(now_tz(eng.tz)), closes, vol_window=int(sc.get("vol_window", 21)))
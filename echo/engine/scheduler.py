@@ -0,0 +1,25 @@
+from __future__ import annotations
+from datetime import datetime, time as dtime
+from typing import Dict
+
+def _hhmm(s: str) -> dtime:
+    h, m = str(s).split(":")
+    return dtime(int(h), int(m))
+
+def next_interval(now: datetime, sched_cfg: Dict) -> float:
+    """Seconds until the next verdict: tight in market hours, sparse off-hours, sparsest on weekends.
+
+    `now` must already be in the configured `timezone`; market_open/close are wall-clock times there.
+    """
+    if now.weekday() >= 5:
+        return float(sched_cfg.get("weekend_interval_s", 3600))
+    open_, close = _hhmm(sched_cfg.get("market_open", "08:30")), _hhmm(sched_cfg.get("market_close", "15:00"))
+    t = now.time()
+    if open_ <= t < close:
+        return float(sched_cfg.get("market_interval_s", 60))
+    offhours = float(sched_cfg.get("offhours_interval_s", 900))
+    if t < open_:
+        # wake up in time for the open instead of sleeping past it
+        until_open = (datetime.combine(now.date(), open_, now.tzinfo) - now).total_seconds()
+        return max(1.0, min(offhours, until_open))
+    return offhours
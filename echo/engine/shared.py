@@ -0,0 +1,114 @@
+from __future__ import annotations
+import hashlib, os, threading, time
+from typing import Dict, Optional, Tuple
+from .echo_engine import EchoEngine, Verdict
+from .history import VerdictStore
+from .snapshots import load_snapshot
+
+# Process-wide engine/verdict cache shared by every Streamlit session and thread.
+# Entries are keyed by the SHA-256 of the config file, so editing config.yaml
+# transparently builds a fresh engine on the next call.
+
+_lock = threading.Lock()
+_key_locks: Dict[str, threading.Lock] = {}
+_hashes: Dict[str, Tuple[float, int, str]] = {}   # abspath -> (mtime, size, sha256)
+_engines: Dict[str, EchoEngine] = {}
+_verdicts: Dict[str, Tuple[float, Verdict]] = {}  # key -> (monotonic computed_at, verdict)
+_stores: Dict[str, VerdictStore] = {}             # sqlite path -> store
+_streams: Dict[str, object] = {}                  # key -> BarStream feeding that engine (`streaming.enabled`)
+
+def config_key(cfg_path: str) -> str:
+    path = os.path.abspath(cfg_path)
+    st = os.stat(path)
+    with _lock:
+        cached = _hashes.get(path)
+    if cached and cached[:2] == (st.st_mtime, st.st_size):
+        return cached[2]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    with _lock:
+        cached = _hashes.get(path)
+        _hashes[path] = (st.st_mtime, st.st_size, digest)
+        if cached and cached[2] != digest:
+            _engines.pop(cached[2], None)
+            _verdicts.pop(cached[2], None)
+            _close_stream(cached[2])
+    return digest
+
+def _key_lock(key: str) -> threading.Lock:
+    with _lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+def get_engine(cfg_path: str = "echo/config.yaml") -> EchoEngine:
+    key = config_key(cfg_path)
+    eng = _engines.get(key)
+    if eng is not None:
+        return eng
+    with _key_lock(key):
+        if key not in _engines:
+            eng = EchoEngine(cfg_path)
+            if eng.config.get("streaming", {}).get("enabled", False):
+                from ..data_providers.stream import start_stream
+                _streams[key] = start_stream(eng)
+            _engines[key] = eng
+        return _engines[key]
+
+def get_verdict(cfg_path: str = "echo/config.yaml", max_age_s: Optional[float] = None) -> Verdict:
+    """Latest verdict for `cfg_path`, recomputed at most once per freshness window across all callers.
+
+    With `scheduler.use_snapshot`, a fresh snapshot written by `python -m echo.daemon` is served instead.
+    """
+    key = config_key(cfg_path)
+    eng = get_engine(cfg_path)
+    sched = eng.config.get("scheduler", {})
+    if sched.get("use_snapshot", False):
+        snap = load_snapshot(sched.get("snapshot_path", "reports/verdict_latest.json"),
+                             max_age_s=float(sched.get("max_snapshot_age_s", 180)))
+        if snap is not None:
+            return snap
+    if max_age_s is None:
+        max_age_s = float(eng.config.get("engine", {}).get("verdict_ttl_seconds", 15))
+    with _key_lock(key):
+        cached = _verdicts.get(key)
+        if cached and time.monotonic() - cached[0] < max_age_s:
+            return cached[1]
+        verdict = eng.run()
+        _verdicts[key] = (time.monotonic(), verdict)
+        store = get_history(cfg_path)
+        if store is not None:
+            store.append(verdict)
+        return verdict
+
+def run_engine(cfg_path: str = "echo/config.yaml", **kwargs) -> Verdict:
+    """Run the shared engine directly (e.g. `trace=True`), serialised with get_verdict's refreshes; the result
+    is not cached."""
+    key = config_key(cfg_path)
+    eng = get_engine(cfg_path)
+    with _key_lock(key):
+        return eng.run(**kwargs)
+
+def get_history(cfg_path: str = "echo/config.yaml") -> Optional[VerdictStore]:
+    """Shared VerdictStore for `cfg_path`, or None when `history.enabled` is off."""
+    cfg = get_engine(cfg_path).config
+    hcfg = cfg.get("history", {})
+    if not hcfg.get("enabled", False):
+        return None
+    path = hcfg.get("path", "reports/verdicts.sqlite")
+    with _lock:
+        if path not in _stores:
+            _stores[path] = VerdictStore.from_config(cfg)
+        return _stores[path]
+
+def _close_stream(key: str):
+    stream = _streams.pop(key, None)
+    if stream is not None:
+        stream.close()
+
+def clear():
+    with _lock:
+        for key in list(_streams):
+            _close_stream(key)
+        _engines.clear()
+        _verdicts.clear()
+        _hashes.clear()
+        _stores.clear()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+import json, os, threading, time
+from dataclasses import asdict, fields
+from typing import Dict, Optional, Tuple
+from ..rules.base import Signal
+from .echo_engine import Verdict
+
+# Verdict <-> JSON, and the "latest verdict" snapshot file the daemon writes and dashboards read.
+
+def verdict_to_dict(verdict: Verdict) -> Dict:
+    return asdict(verdict)
+
+def verdict_from_dict(d: Dict) -> Verdict:
+    known = {f.name for f in fields(Verdict)}
+    kw = {k: v for k, v in d.items() if k in known}
+    kw["signals"] = [Signal(**s) for s in kw.get("signals", [])]
+    return Verdict(**kw)
+
+def save_snapshot(verdict: Verdict, path: str, computed_at: Optional[float] = None):
+    """Atomically replace `path` with the verdict and its computation time (epoch seconds)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = {"computed_at": computed_at if computed_at is not None else time.time(), "verdict": verdict_to_dict(verdict)}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, default=str)
+    os.replace(tmp, path)
+
+_lock = threading.Lock()
+_loaded: Dict[str, Tuple[float, float, Verdict]] = {}  # path -> (file mtime, computed_at, verdict)
+
+def load_snapshot(path: str, max_age_s: Optional[float] = None) -> Optional[Verdict]:
+    """Latest snapshot at `path`, or None if missing, unreadable or older than `max_age_s`. Parsed once per file version."""
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is None or cached[0] != mtime:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+                cached = (mtime, float(payload["computed_at"]), verdict_from_dict(payload["verdict"]))
+            except Exception:
+                return None
+            _loaded[path] = cached
+    if max_age_s is not None and time.time() - cached[1] > max_age_s:
+        return None
+    return cached[2]
@@ -1,25 +1,75 @@
 from __future__ import annotations
 import argparse, os
-from .engine.echo_engine import EchoEngine
-from .engine.reports import format_daily
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .engine.echo_engine import EchoEngine
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--report", choices=["daily"], default="daily")
+    ap.add_argument("--report", choices=["daily", "backtest", "batch", "scan"], default="daily")
     ap.add_argument("--config", default="echo/config.yaml")
+    ap.add_argument("--configs", nargs="+", help="batch: config files and/or directories of *.yaml")
+    ap.add_argument("--workers", type=int, help="batch: worker processes (default: CPU count)")
+    ap.add_argument("--start", help="backtest: first date (YYYY-MM-DD)")
+    ap.add_argument("--end", help="backtest: last date (YYYY-MM-DD)")
+    ap.add_argument("--period", default="10y", help="backtest: history to load per ticker")
+    ap.add_argument("--universe", help="scan: ticker list file (default scanner.universe_file)")
     args = ap.parse_args()
+    if args.report == "batch":
+        return batch(args)
 
+    from .engine.echo_engine import EchoEngine
+    from .engine.reports import format_daily
     eng = EchoEngine(args.config)
+    out_dir = eng.config.get("reporting",{}).get("out_dir","reports")
+    os.makedirs(out_dir, exist_ok=True)
+    if args.report == "backtest":
+        return backtest(eng, out_dir, args)
+    if args.report == "scan":
+        return scan(eng, out_dir, args)
+
     verdict = eng.run()
     out = format_daily(verdict)
 
-    out_dir = eng.config.get("reporting",{}).get("out_dir","reports")
-    os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, "echo_daily.md")
     with open(out_path, "w", encoding="utf-8") as f:
         f.write(out)
     print(f"Report written: {out_path}\n")
     print(out)
 
+def backtest(eng: EchoEngine, out_dir: str, args):
+    from .engine.backtest import load_closes, run_backtest
+    closes = load_closes(eng.provider, eng.slots.values(), period=args.period)
+    result = run_backtest(eng.config, closes, start=args.start, end=args.end)
+    out_path = os.path.join(out_dir, "echo_backtest.csv")
+    result.frame.to_csv(out_path)
+    print(f"Backtest written: {out_path} ({len(result.frame)} days)\n")
+    print(result.summary().to_string(float_format=lambda x: f"{x:+.4f}"))
+
+def scan(eng: EchoEngine, out_dir: str, args):
+    from .engine.scanner import load_universe, run_scan
+    table = run_scan(eng, load_universe(args.universe) if args.universe else None)
+    out_path = os.path.join(out_dir, "echo_scan.csv")
+    table.to_csv(out_path)
+    print(f"Scan written: {out_path} ({len(table)} tickers)\n")
+    print(table.head(int(eng.config.get("scanner", {}).get("top", 25))).drop(columns=["PEAD Detail"]).to_string())
+
+def batch(args):
+    from .engine.batch import collect_configs, run_batch
+    from .engine.echo_engine import load_config
+    configs = collect_configs(args.configs or [args.config])
+    if not configs:
+        raise SystemExit(f"Batch: no config files found in {' '.join(args.configs or [args.config])}")
+    try:
+        reporting = (load_config(configs[0]) or {}).get("reporting", {})
+    except Exception:
+        reporting = {}  # run_batch reports the broken config as a failed item
+    out_dir = os.path.join(reporting.get("out_dir", "reports"), "batch")
+    items = run_batch(configs, out_dir, workers=args.workers)
+    failed = [it for it in items if it.verdict is None]
+    print(f"Batch: {len(items) - len(failed)}/{len(items)} reports written to {out_dir} (index.md)")
+    for it in failed:
+        print(f"  FAILED {it.config_path}: {it.error}")
+
 if __name__ == "__main__":
     main()
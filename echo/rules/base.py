@@ -1,4 +1,15 @@
+import asyncio
 from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+_GRANULARITY_FMT = {"static": "", "day": "%Y-%m-%d", "hour": "%Y-%m-%d %H", "minute": "%Y-%m-%d %H:%M"}
+
+def config_value(config, dotted: str) -> Any:
+    node = config
+    for part in dotted.split("."):
+        node = node.get(part) if isinstance(node, dict) else None
+    return node
+
 @dataclass
 class Signal:
     name: str
@@ -6,5 +17,39 @@ class Signal:
     detail: str
     severity: str = "green"  # green|yellow|red
 class Rule:
+    # Declared inputs, used by EchoEngine to reuse the previous Signal when nothing changed.
+    # granularity: "static" | "day" | "hour" | "minute" — how often the clock alone can change the
+    # result; None (default) means always recompute.
+    granularity: Optional[str] = None
+    config_keys: Tuple[str, ...] = ()   # dotted config paths the rule reads, e.g. "calendar.fomc_dates"
+
     def run(self, context) -> Signal:
         raise NotImplementedError
+    def data_inputs(self, context) -> List[Tuple[str, str, str]]:
+        """(ticker, period, interval) history the rule reads from the provider."""
+        return []
+    def input_key(self, context, data_refresh_s: float = 300) -> Optional[tuple]:
+        if self.granularity is None:
+            return None
+        now = context["now"]
+        key: tuple = (now.strftime(_GRANULARITY_FMT[self.granularity]),
+                      tuple(repr(config_value(context["config"], k)) for k in self.config_keys))
+        data = tuple(self.data_inputs(context))
+        if data:
+            key += (data, int(now.timestamp() // data_refresh_s))
+        return key
+    def score_series(self, dates, context):
+        """Scores for every date in `dates` (a tz-naive DatetimeIndex) as a pd.Series named after the signal.
+
+        The default replays `run` once per day; calendar rules override it with a vectorized version.
+        """
+        import pandas as pd
+        scores, name = [], None
+        for d in dates:
+            sig = self.run({**context, "now": d.to_pydatetime()})
+            scores.append(sig.score)
+            name = sig.name
+        return pd.Series(scores, index=dates, name=name, dtype=float)
+    async def arun(self, context) -> Signal:
+        # Rules that fetch data should override this and await context["aprovider"].
+        return await asyncio.to_thread(self.run, context)
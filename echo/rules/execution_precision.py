@@ -1,5 +1,6 @@
 from __future__ import annotations
 from .base import Rule, Signal
 class ExecutionPrecision(Rule):
+    granularity = "static"
     def run(self, context):
         return Signal("Execution Precision", 55, "Use marketable limits; stage near VWAP; only add if vol ≥1.5× avg.", "green")
@@ -1,15 +1,19 @@
 from __future__ import annotations
 from .base import Rule, Signal
-from datetime import timedelta
-from dateutil import parser
+from ..utils.calendar_index import CalendarIndex, FOMC
+import numpy as np
 
 class FOMCTilt(Rule):
+    granularity = "day"
+    config_keys = ("calendar.fomc_dates", "calendar.files")
     def run(self, context):
-        today = context["now"].date()
-        fomc_dates = [parser.parse(d).date() for d in context["config"].get("calendar", {}).get("fomc_dates", [])]
         score, severity, detail = 0.0, "green", "No FOMC tilt"
-        for d in fomc_dates:
-            if today == d - timedelta(days=1):
-                score, severity, detail = 80.0, "yellow", "Pre-FOMC day: consider +5–10% Core tilt"
-                break
+        # Strictly-after lookup: on day one of a two-day meeting the next event is still tomorrow.
+        if CalendarIndex.of(context).days_until(FOMC, context["now"], inclusive=False) == 1:
+            score, severity, detail = 80.0, "yellow", "Pre-FOMC day: consider +5–10% Core tilt"
         return Signal("FOMC Tilt", score, detail, severity)
+
+    def score_series(self, dates, context):
+        import pandas as pd
+        until = CalendarIndex.of(context).days_until(FOMC, dates, inclusive=False)
+        return pd.Series(np.where(until == 1, 80.0, 0.0), index=dates, name="FOMC Tilt")
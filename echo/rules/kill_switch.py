@@ -0,0 +1,69 @@
+from __future__ import annotations
+import os, threading
+from .base import Rule, Signal
+
+class KillSwitch(Rule):
+    """Red when any account's max drawdown over the last `window_days` reaches `risk.kill_switch_drawdown_30d_pct`,
+    or a position in the loan-funded slot is down `risk.loan_stop_pct` from cost. Holdings come from the
+    `portfolio:` config; the equity curve is kept between runs and only new bars are applied."""
+    granularity = "day"
+    config_keys = ("portfolio", "slots", "risk.kill_switch_drawdown_30d_pct", "risk.loan_stop_pct")
+
+    def __init__(self, loan_slot: str = "wildcard", window_days: float = 30, period: str = "3mo"):
+        self.loan_slot = loan_slot
+        self.window_days = window_days
+        self.period = period
+        self._lock = threading.Lock()
+        self._key = None
+        self._book = None  # (Portfolio, DrawdownMonitor) for the current holdings
+
+    def data_inputs(self, context):
+        portfolio, _ = self._state(context)
+        return [(t, self.period, "1d") for t in portfolio.tickers] if portfolio.shares.any() else []
+
+    def run(self, context):
+        portfolio, monitor = self._state(context)
+        if not portfolio.shares.any():
+            return Signal("Kill Switch", 0, "No positions", "green")
+        from ..engine.backtest import load_closes  # pandas; only needed once there are holdings
+        closes = load_closes(context["provider"], portfolio.tickers, period=self.period)
+        with self._lock:
+            monitor.feed(closes)
+            return self._signal(context["config"].get("risk", {}), portfolio, monitor)
+
+    def _state(self, context):
+        """Portfolio and monitor, rebuilt only when the holdings config (or positions file) changes."""
+        cfg = context["config"]
+        pcfg = cfg.get("portfolio", {}) or {}
+        path = pcfg.get("positions_file")
+        key = (repr(pcfg), repr(cfg.get("slots")), os.path.getmtime(path) if path and os.path.exists(path) else None)
+        with self._lock:
+            if key != self._key:
+                from ..engine.portfolio import Portfolio
+                from ..engine.risk_monitor import DrawdownMonitor
+                portfolio = Portfolio.from_config(cfg)
+                self._book, self._key = (portfolio, DrawdownMonitor(portfolio, self.window_days)), key
+            return self._book
+
+    def _signal(self, risk, portfolio, monitor):
+        import numpy as np
+        dd_limit = float(risk.get("kill_switch_drawdown_30d_pct", 20))
+        loan_stop = float(risk.get("loan_stop_pct", -6))
+        dd = monitor.max_drawdown * 100
+        marks = portfolio.mark(monitor.last_prices)
+        loan_slot = portfolio.slots.index(self.loan_slot) if self.loan_slot in portfolio.slots else -1
+        stopped = np.flatnonzero((portfolio.slot_idx == loan_slot) & (portfolio.shares != 0)
+                                 & (marks.unrealized_pct * 100 <= loan_stop))
+        tripped = np.flatnonzero(dd <= -dd_limit)
+        if tripped.size or stopped.size:
+            parts = [f"{portfolio.accounts[a]} 30d drawdown {dd[a]:.1f}%" for a in tripped[:3]]
+            parts += [f"{portfolio.tickers[portfolio.ticker_idx[i]]} ({portfolio.accounts[portfolio.account_idx[i]]}) "
+                      f"{marks.unrealized_pct[i] * 100:+.1f}% vs loan stop {loan_stop:.0f}%" for i in stopped[:3]]
+            more = tripped.size + stopped.size - len(parts)
+            detail = "; ".join(parts) + (f" (+{more} more)" if more > 0 else "")
+            return Signal("Kill Switch", 100, f"TRIPPED: {detail} → no new risk, move to cash", "red")
+        worst = monitor.worst()
+        used = min(-dd[worst] / dd_limit, 1.0) if dd_limit > 0 else 0.0
+        return Signal("Kill Switch", round(used * 100),
+                      f"Worst 30d drawdown {dd[worst]:.1f}% ({portfolio.accounts[worst]}) vs -{dd_limit:.0f}% limit",
+                      "yellow" if used >= 0.5 else "green")
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from .base import Rule, Signal
 class LoanAccelerator(Rule):
+    granularity = "static"
+    config_keys = ("loan_accelerator", "slots.wildcard", "whispers")
     def run(self, context):
         cfg = context["config"].get("loan_accelerator", {})
         if not cfg.get("enabled", True):
@@ -1,28 +1,50 @@
 from __future__ import annotations
 from .base import Rule, Signal
-from dateutil import parser
+from ..utils.calendar_index import CalendarIndex, EARNINGS
+import numpy as np
 
 class PEAD(Rule):
+    granularity = "day"
+    config_keys = ("slots", "calendar.earnings", "calendar.files", "whispers")
     def __init__(self, slot_key: str):
         self.slot_key = slot_key
     def run(self, context):
+        return self.signal_for(context, context["slots"][self.slot_key])
+
+    @staticmethod
+    def signal_for(context, ticker: str) -> Signal:
+        """PEAD signal for any ticker (the scanner evaluates it across a universe, not just the slots)."""
         cfg = context["config"]
-        earnings = cfg.get("calendar", {}).get("earnings", {})
-        ticker = context["slots"][self.slot_key]
-        dstr = earnings.get(ticker)
-        if not dstr:
+        cal = CalendarIndex.of(context)
+        if not len(cal.events(EARNINGS, ticker)):
             return Signal(f"PEAD:{ticker}", 0, f"No earnings date set for {ticker}", "green")
-        d = parser.parse(dstr).date()
-        today = context["now"].date()
-        if today < d:
-            whisper = cfg.get("whispers", {}).get(ticker, {})
-            if whisper:
-                gap = float(whisper.get("whisper_eps", 0)) - float(whisper.get("consensus_eps", 0))
-                if gap > 0:
-                    return Signal(f"PEAD:{ticker}", 60, f"Pre-earnings; positive whisper gap {gap:+.02f}", "yellow")
-            return Signal(f"PEAD:{ticker}", 30, "Pre-earnings; no whisper data", "green")
-        delta = (today - d).days
-        if 1 <= delta <= 30:
+        delta = cal.days_since(EARNINGS, context["now"], ticker)
+        if delta is not None and 1 <= delta <= 30:
             score = max(30.0, 75.0 - (delta-1)*1.5)
             return Signal(f"PEAD:{ticker}", score, f"Post-earnings drift day {delta}", "green")
+        if delta != 0 and cal.next_event(EARNINGS, context["now"], ticker, inclusive=False) is not None:
+            gap = PEAD._whisper_gap(cfg, ticker)
+            if gap is not None and gap > 0:
+                return Signal(f"PEAD:{ticker}", 60, f"Pre-earnings; positive whisper gap {gap:+.02f}", "yellow")
+            return Signal(f"PEAD:{ticker}", 30, "Pre-earnings; no whisper data", "green")
         return Signal(f"PEAD:{ticker}", 0, "Outside PEAD window", "green")
+
+    @staticmethod
+    def _whisper_gap(cfg, ticker):
+        whisper = cfg.get("whispers", {}).get(ticker, {})
+        return float(whisper.get("whisper_eps", 0)) - float(whisper.get("consensus_eps", 0)) if whisper else None
+
+    def score_series(self, dates, context):
+        import pandas as pd
+        ticker = context["slots"][self.slot_key]
+        name = f"PEAD:{ticker}"
+        cal = CalendarIndex.of(context)
+        if not len(cal.events(EARNINGS, ticker)):
+            return pd.Series(0.0, index=dates, name=name)
+        since = cal.days_since(EARNINGS, dates, ticker)
+        ahead = ~np.isnan(cal.days_until(EARNINGS, dates, ticker, inclusive=False))
+        gap = self._whisper_gap(context["config"], ticker)
+        pre = 60.0 if gap is not None and gap > 0 else 30.0
+        drift = np.maximum(30.0, 75.0 - (since - 1) * 1.5)
+        scores = np.select([(since >= 1) & (since <= 30), ahead & (since != 0)], [drift, pre], 0.0)
+        return pd.Series(scores, index=dates, name=name)
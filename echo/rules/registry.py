@@ -0,0 +1,128 @@
+from __future__ import annotations
+import importlib
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
+from .base import Rule
+
+# Rule name -> "module:Class". Modules are imported on first use, so a run only pays for the rules it builds
+# (and their dependencies, e.g. pandas for data rules). Relative modules resolve against echo.rules.
+BUILTIN_RULES: Dict[str, str] = {
+    "fomc_tilt": ".fomc_tilt:FOMCTilt",
+    "turn_of_month": ".tom_window:TurnOfMonth",
+    "pead": ".pead:PEAD",
+    "volatility_regime": ".volatility_regime:VolatilityRegime",
+    "execution_precision": ".execution_precision:ExecutionPrecision",
+    "loan_accelerator": ".loan_accelerator:LoanAccelerator",
+    "kill_switch": ".kill_switch:KillSwitch",
+}
+
+# The engine's rule set when the config has no `rules:` section, in signal order: (rule name, constructor kwargs).
+DEFAULT_RULES: List[Tuple[str, Dict]] = [
+    ("fomc_tilt", {}),
+    ("turn_of_month", {}),
+    ("pead", {"slot_key": "momentum"}),
+    ("pead", {"slot_key": "wildcard"}),
+    ("volatility_regime", {}),
+    ("execution_precision", {}),
+    ("loan_accelerator", {}),
+]
+
+ENTRY_POINT_GROUP = "echo.rules"
+
+class RuleRegistry:
+    """Rule name -> class, resolved lazily from built-ins, `echo.rules` entry points and plugin modules.
+
+    Third-party packages register rules with an entry point, e.g. in pyproject.toml:
+
+        [project.entry-points."echo.rules"]
+        gap_fill = "my_pkg.rules:GapFill"
+
+    or list a module under `rule_modules:` in config.yaml that defines `ECHO_RULES = {"gap_fill": GapFill}`.
+    """
+    def __init__(self, targets: Optional[Dict[str, str]] = None):
+        self._targets: Dict[str, Union[str, Type[Rule]]] = dict(BUILTIN_RULES if targets is None else targets)
+        self._classes: Dict[str, Type[Rule]] = {}
+        self._entry_points_loaded = False
+
+    def copy(self) -> "RuleRegistry":
+        reg = RuleRegistry(dict(self._targets))
+        reg._classes = dict(self._classes)
+        reg._entry_points_loaded = self._entry_points_loaded
+        return reg
+
+    def register(self, name: str, target: Union[str, Type[Rule]]):
+        self._targets[name] = target
+        self._classes.pop(name, None)
+
+    def load_modules(self, modules: Iterable[str]):
+        for path in modules:
+            for name, target in getattr(importlib.import_module(path), "ECHO_RULES", {}).items():
+                self.register(name, target)
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP):
+        from importlib.metadata import entry_points
+        for ep in entry_points(group=group):
+            self._targets.setdefault(ep.name, ep.value)
+        self._entry_points_loaded = True
+
+    def names(self) -> List[str]:
+        if not self._entry_points_loaded:
+            self.load_entry_points()
+        return sorted(self._targets)
+
+    def get(self, name: str) -> Type[Rule]:
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        if name not in self._targets and not self._entry_points_loaded:
+            self.load_entry_points()  # only scanned when a name isn't built in
+        target = self._targets.get(name)
+        if target is None:
+            raise ValueError(f"Unknown rule: {name}")
+        if isinstance(target, str):
+            module, _, attr = target.partition(":")
+            cls = getattr(importlib.import_module(module, package=__package__), attr)
+        else:
+            cls = target
+        self._classes[name] = cls
+        return cls
+
+    def build(self, specs: List[Tuple[str, Dict]]) -> List[Rule]:
+        rules = []
+        for name, params in specs:
+            try:
+                rules.append(self.get(name)(**params))
+            except TypeError as e:
+                raise ValueError(f"Bad params for rule {name}: {e}") from e
+        return rules
+
+_default = RuleRegistry()
+
+def load_rule_class(name: str) -> Type[Rule]:
+    return _default.get(name)
+
+def build_rules(specs: List[Tuple[str, Dict]]) -> List[Rule]:
+    return _default.build(specs)
+
+def rule_specs(cfg: Dict) -> List[Tuple[str, Dict]]:
+    """Enabled (rule name, params) pairs from the `rules:` config section, in file order.
+
+    Each entry is `<id>: {enabled, rule, params}`; `rule` defaults to the id, so the same rule can be listed
+    twice with different params (e.g. PEAD per slot). Disabled entries are dropped before anything is built.
+    """
+    section = cfg.get("rules")
+    if section is None:
+        return list(DEFAULT_RULES)
+    specs = []
+    for rule_id, entry in section.items():
+        entry = {} if entry is None else ({"enabled": entry} if isinstance(entry, bool) else entry)
+        if entry.get("enabled", True):
+            specs.append((entry.get("rule", rule_id), dict(entry.get("params") or {})))
+    return specs
+
+def rules_from_config(cfg: Dict, registry: Optional[RuleRegistry] = None) -> List[Rule]:
+    """Instantiate the config's enabled rules; `rule_modules` are registered on a copy of the registry."""
+    registry = registry or _default
+    if cfg.get("rule_modules"):
+        registry = registry.copy()
+        registry.load_modules(cfg["rule_modules"])
+    return registry.build(rule_specs(cfg))
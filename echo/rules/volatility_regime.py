@@ -1,16 +1,59 @@
 from __future__ import annotations
 from .base import Rule, Signal
+import numpy as np
+
+HIGH_VOL, LOW_VOL = 35.0, 15.0   # annualized %, inclusive bounds
+REGIME_WINDOW = 21               # daily returns in the 1mo history; online stats track the same window
 
 class VolatilityRegime(Rule):
+    granularity = "day"
+    config_keys = ("slots.core",)
+
+    def data_inputs(self, context):
+        return [(context["slots"]["core"], "1mo", "1d")]
+
     def run(self, context):
         core = context["slots"]["core"]
-        hist = context["provider"].history(core, period="1mo", interval="1d")
+        vol = self._online_vol(context, core)
+        if vol is not None:
+            return self._label(vol)
+        return self._classify(context["provider"].history(core, period="1mo", interval="1d"))
+
+    async def arun(self, context):
+        core = context["slots"]["core"]
+        if context.get("aprovider") is None or self._online_vol(context, core) is not None:
+            return await super().arun(context)
+        return self._classify(await context["aprovider"].history(core, period="1mo", interval="1d"))
+
+    @staticmethod
+    def _online_vol(context, ticker):
+        """Annualized vol (%) from the engine's online stats (streaming daily bars), or None to read history instead."""
+        stats = context.get("stats")
+        if stats is not None and not stats.measures("1d", REGIME_WINDOW):
+            stats = None
+        s = stats.get(ticker) if stats is not None else None
+        vol = s.ann_vol(REGIME_WINDOW) if s is not None else None
+        return vol * 100 if vol is not None and vol == vol else None
+
+    @staticmethod
+    def _classify(hist):
         if hist is None or hist.empty:
             return Signal("Volatility Regime", 0, "No data", "green")
-        ret = hist["Close"].pct_change().dropna()
-        vol = float(ret.std() * (252 ** 0.5) * 100)
-        if vol >= 35:
+        from ..engine.risk_metrics import series_metrics  # pandas; only needed once there is data
+        return VolatilityRegime._label(float(series_metrics(hist["Close"])["ann_vol"] * 100))
+
+    @staticmethod
+    def _label(vol):
+        if vol != vol:
+            return Signal("Volatility Regime", 0, "No data", "green")
+        if vol >= HIGH_VOL:
             return Signal("Volatility Regime", 80, f"High vol (~{vol:.1f}%) → tighten stops, build cash", "yellow")
-        elif vol <= 15:
+        elif vol <= LOW_VOL:
             return Signal("Volatility Regime", 60, f"Low vol (~{vol:.1f}%) → looser stops ok", "green")
         return Signal("Volatility Regime", 50, f"Normal vol (~{vol:.1f}%)", "green")
+
+    @staticmethod
+    def scores(vol):
+        """Vectorized regime score for an array of annualized vol (%); NaN (no data) scores 0."""
+        vol = np.asarray(vol, dtype=float)
+        return np.select([np.isnan(vol), vol >= HIGH_VOL, vol <= LOW_VOL], [0.0, 80.0, 60.0], 50.0)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import csv, os
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import yaml
+from dateutil import parser
+
+# Event calendars parsed once into sorted datetime64[D] arrays (NumPy only, no pandas import). Every query takes
+# a scalar date/datetime (returns a scalar) or an array/DatetimeIndex of days (returns an array) and is a
+# searchsorted lookup.
+
+FOMC = "fomc"
+EARNINGS = "earnings"
+_EMPTY = np.array([], dtype="datetime64[D]")
+
+def as_days(on):
+    """Calendar day(s) of `on`; aware datetimes/indexes keep their local wall-clock date."""
+    if isinstance(on, datetime):
+        return np.datetime64(on.date(), "D")
+    if isinstance(on, (date, np.datetime64, str)):
+        return np.datetime64(on, "D")
+    if getattr(on, "tz", None) is not None:  # tz-aware pandas DatetimeIndex
+        on = on.tz_localize(None)
+    return np.asarray(on).astype("datetime64[D]")
+
+def _parse(values) -> np.ndarray:
+    if values is None:
+        return _EMPTY
+    if isinstance(values, (str, date)):
+        values = [values]
+    try:
+        days = np.array([v.date() if isinstance(v, datetime) else v for v in values], dtype="datetime64[D]")
+    except ValueError:  # not all ISO dates, e.g. "Oct 29 2025"
+        days = np.array([parser.parse(v).date() if isinstance(v, str) else v for v in values], dtype="datetime64[D]")
+    return np.unique(days)
+
+def _load_file(path: str) -> Dict:
+    """A YAML file shaped like the `calendar` config section, or a CSV with event,ticker,date columns."""
+    if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+        with open(path, "r") as f:
+            return yaml.safe_load(f) or {}
+    out: Dict = {"fomc_dates": [], "earnings": {}}
+    with open(path, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            event = row["event"].strip().lower()
+            if event == FOMC:
+                out["fomc_dates"].append(row["date"])
+            elif event == EARNINGS:
+                out["earnings"].setdefault(row["ticker"].strip(), []).append(row["date"])
+    return out
+
+class CalendarIndex:
+    def __init__(self, fomc: Iterable = (), earnings: Optional[Dict[str, Iterable]] = None):
+        self.fomc = _parse(list(fomc))
+        self.earnings: Dict[str, np.ndarray] = {t: _parse(d) for t, d in (earnings or {}).items()}
+
+    @classmethod
+    def from_config(cls, cfg: Dict) -> "CalendarIndex":
+        """`calendar.fomc_dates` / `calendar.earnings` merged with every file listed in `calendar.files`."""
+        cal = cfg.get("calendar", {}) or {}
+        fomc: List = list(cal.get("fomc_dates", []) or [])
+        earnings: Dict[str, List] = {}
+        for src in [cal] + [_load_file(p) for p in cal.get("files", []) or []]:
+            if src is not cal:
+                fomc += list(src.get("fomc_dates", []) or [])
+            for t, d in (src.get("earnings", {}) or {}).items():
+                earnings.setdefault(t, []).extend([d] if isinstance(d, (str, date)) else list(d))
+        return cls(fomc, earnings)
+
+    @staticmethod
+    def of(context: Dict) -> "CalendarIndex":
+        """The index the engine built for this context, or a fresh one from its config."""
+        cal = context.get("calendar")
+        return cal if cal is not None else CalendarIndex.from_config(context["config"])
+
+    def events(self, kind: str, key: Optional[str] = None) -> np.ndarray:
+        if kind == FOMC:
+            return self.fomc
+        if kind == EARNINGS:
+            return self.earnings.get(key, _EMPTY)
+        raise ValueError(f"Unknown calendar event kind: {kind}")
+
+    def next_event(self, kind: str, on, key: Optional[str] = None, inclusive: bool = True):
+        """First event on/after `on` (strictly after if not inclusive); None / NaT where there is none."""
+        ev, days = self.events(kind, key), as_days(on)
+        idx = np.searchsorted(ev, days, side="left" if inclusive else "right")
+        return self._pick(ev, idx, idx < len(ev), days)
+
+    def prev_event(self, kind: str, on, key: Optional[str] = None, inclusive: bool = True):
+        """Last event on/before `on` (strictly before if not inclusive); None / NaT where there is none."""
+        ev, days = self.events(kind, key), as_days(on)
+        idx = np.searchsorted(ev, days, side="right" if inclusive else "left") - 1
+        return self._pick(ev, idx, idx >= 0, days)
+
+    def days_until(self, kind: str, on, key: Optional[str] = None, inclusive: bool = True):
+        nxt = self.next_event(kind, on, key, inclusive)
+        return _days_between(as_days(on), nxt)
+
+    def days_since(self, kind: str, on, key: Optional[str] = None, inclusive: bool = True):
+        prev = self.prev_event(kind, on, key, inclusive)
+        return _days_between(prev, as_days(on))
+
+    def in_window(self, kind: str, on, before: int = 0, after: int = 0, key: Optional[str] = None):
+        """True where an event falls within [on - after, on + before], i.e. `on` is up to `before` days
+        ahead of an event or up to `after` days past one."""
+        ev, days = self.events(kind, key), as_days(on)
+        if len(ev) == 0:
+            hit = np.zeros(np.shape(days), dtype=bool)
+        else:
+            idx = np.searchsorted(ev, days - np.timedelta64(after, "D"), side="left")
+            hit = (idx < len(ev)) & (ev[np.minimum(idx, len(ev) - 1)] <= days + np.timedelta64(before, "D"))
+        return bool(hit) if np.ndim(hit) == 0 else hit
+
+    @staticmethod
+    def turn_of_month(on, first_days: int = 3, last_days: int = 3):
+        """True in the first `first_days` or last `last_days` calendar days of the month."""
+        days = as_days(on)
+        month = days.astype("datetime64[M]")
+        since_first = (days - month.astype("datetime64[D]")).astype(int)
+        to_next = ((month + 1).astype("datetime64[D]") - days).astype(int)
+        hit = (since_first < first_days) | (to_next <= last_days)
+        return bool(hit) if np.ndim(hit) == 0 else hit
+
+    def upcoming(self, on) -> List[Dict]:
+        """Countdown rows (Event, Date, Days): the next FOMC and next earnings per ticker on/after `on`,
+        or the most recent one for calendars with nothing upcoming."""
+        today = as_days(on)
+        rows = []
+        for label, kind, key in [("FOMC", FOMC, None)] + [(f"Earnings:{t}", EARNINGS, t) for t in self.earnings]:
+            d = self.next_event(kind, today, key)
+            if d is None:
+                d = self.prev_event(kind, today, key)
+            if d is not None:
+                rows.append({"Event": label, "Date": str(d), "Days": int((d - today).astype(int))})
+        return rows
+
+    @staticmethod
+    def _pick(ev: np.ndarray, idx, ok, days):
+        if np.ndim(days) == 0:
+            return ev[idx] if ok else None
+        out = np.full(len(days), np.datetime64("NaT"), dtype="datetime64[D]")
+        out[ok] = ev[idx[ok]]
+        return out
+
+def _days_between(a, b):
+    if a is None or b is None:
+        return None
+    diff = (b - a).astype("timedelta64[D]")
+    if np.ndim(diff) == 0:
+        return int(diff.astype(int))
+    return np.where(np.isnat(diff), np.nan, diff.astype(int).astype(float))
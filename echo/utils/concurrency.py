@@ -0,0 +1,148 @@
+from __future__ import annotations
+import random, threading, time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+# Small thread-safe building blocks for talking to flaky upstreams: collapse identical in-flight calls,
+# back off with jitter between retries, and stop calling a host that keeps failing.
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution of `fn`.
+
+    `do` returns (result, shared); shared is True for callers that waited on another thread's call, so
+    mutable results (DataFrames) can be copied before use. Exceptions propagate to every waiter.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "_Call"] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def do_many(self, keys: Iterable[Hashable], fn: Callable[[List], Dict]) -> Dict:
+        """Batched `do`: keys no other thread is fetching are fetched together by one `fn(keys)` call (a dict;
+        absent keys map to None), keys already in flight are awaited. Returns key -> result."""
+        mine: Dict[Hashable, _Call] = {}
+        theirs: Dict[Hashable, _Call] = {}
+        with self._lock:
+            for k in dict.fromkeys(keys):
+                call = self._calls.get(k)
+                if call is None:
+                    mine[k] = self._calls[k] = _Call()
+                else:
+                    theirs[k] = call
+        out: Dict = {}
+        if mine:
+            try:
+                res = fn(list(mine))
+                for k, call in mine.items():
+                    call.result = out[k] = res.get(k)
+            except BaseException as e:
+                for call in mine.values():
+                    call.error = e
+                raise
+            finally:
+                with self._lock:
+                    for k in mine:
+                        self._calls.pop(k, None)
+                for call in mine.values():
+                    call.done.set()
+        for k, call in theirs.items():
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            out[k] = call.result
+        return out
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+def backoff_delay(attempt: int, base_s: float = 0.5, max_s: float = 8.0) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max_s, base_s * 2**attempt)]."""
+    return random.uniform(0.0, min(max_s, base_s * (2 ** attempt)))
+
+class CircuitOpen(RuntimeError):
+    pass
+
+class CircuitBreaker:
+    """Opens after `failures` consecutive errors; while open, calls fail fast for `reset_s`, then one
+    trial call is let through (half-open) and its outcome closes or re-opens the circuit."""
+    def __init__(self, name: str, failures: int = 5, reset_s: float = 60.0):
+        self.name = name
+        self.failures = failures
+        self.reset_s = reset_s
+        self._lock = threading.Lock()
+        self._errors = 0
+        self._opened_at = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_s else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_s or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self._errors, self._opened_at, self._trial = 0, None, False
+
+    def failure(self):
+        with self._lock:
+            self._errors += 1
+            if self._trial or self._errors >= self.failures:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        if not self.allow():
+            raise CircuitOpen(f"Circuit open for {self.name}")
+        try:
+            result = fn()
+        except Exception:
+            self.failure()
+            raise
+        self.success()
+        return result
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def breaker_for(host: str, failures: int = 5, reset_s: float = 60.0) -> CircuitBreaker:
+    """Process-wide breaker per upstream host, shared by every provider (engines, dashboards, batch) talking to it."""
+    with _breakers_lock:
+        b = _breakers.get(host)
+        if b is None:
+            b = _breakers[host] = CircuitBreaker(host, failures, reset_s)
+        return b
@@ -1,6 +1,10 @@
 from __future__ import annotations
 from datetime import datetime
 from dateutil import tz
+import re
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    import pandas as pd
 
 def now_tz(tz_name: str) -> datetime:
     tzinfo = tz.gettz(tz_name)
@@ -8,3 +12,30 @@ def now_tz(tz_name: str) -> datetime:
 
 def fmt_ts(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d %H:%M")
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+def period_start(period: str, now: pd.Timestamp | None = None) -> pd.Timestamp | None:
+    """Earliest timestamp covered by a yfinance-style period ("5d", "3mo", "1y", "ytd"); None for "max"."""
+    import pandas as pd
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    m = _PERIOD_RE.match(period)
+    if not m:
+        raise ValueError(f"Unsupported period: {period}")
+    n, unit = int(m.group(1)), m.group(2)
+    offset = {"d": pd.DateOffset(days=n), "wk": pd.DateOffset(weeks=n),
+              "mo": pd.DateOffset(months=n), "y": pd.DateOffset(years=n)}[unit]
+    return now - offset
+
+def covering_period(start: pd.Timestamp, now: pd.Timestamp | None = None) -> str:
+    """Smallest standard yfinance period that reaches back to `start`."""
+    import pandas as pd
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    for p in ("5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y"):
+        if period_start(p, now) <= start:
+            return p
+    return "max"
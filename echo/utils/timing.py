@@ -0,0 +1,82 @@
+from __future__ import annotations
+import json, threading, time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# Lightweight span recorder. `span()` is a no-op returning a shared null object unless a Tracer is
+# active in the current context (see `tracing`), so instrumented code pays one ContextVar lookup.
+
+class Tracer:
+    def __init__(self, spans: Optional[List[Dict]] = None):
+        self.spans: List[Dict] = spans if spans is not None else []
+
+class _Span:
+    __slots__ = ("tracer", "rec", "t0")
+    def __init__(self, tracer: Tracer, name: str, attrs: Dict):
+        self.tracer = tracer
+        self.rec = {"name": name, **attrs}
+    def set(self, **attrs):
+        self.rec.update(attrs)
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self.rec["start"] = self.t0
+        self.rec["duration_s"] = time.perf_counter() - self.t0
+        self.rec["thread"] = threading.current_thread().name
+        if exc_type is not None:
+            self.rec["error"] = exc_type.__name__
+        self.tracer.spans.append(self.rec)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+    def set(self, **attrs):
+        pass
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL = _NullSpan()
+_current: ContextVar[Optional[Tracer]] = ContextVar("echo_tracer", default=None)
+
+def span(name: str, **attrs):
+    tracer = _current.get()
+    return _NULL if tracer is None else _Span(tracer, name, attrs)
+
+class tracing:
+    """Activate `tracer` for the current context (threads started via contextvars.copy_context inherit it)."""
+    def __init__(self, tracer: Optional[Tracer]):
+        self.tracer = tracer
+    def __enter__(self):
+        self._token = _current.set(self.tracer) if self.tracer is not None else None
+        return self.tracer
+    def __exit__(self, *exc):
+        if self._token is not None:
+            _current.reset(self._token)
+        return False
+
+def record(tracer: Optional[Tracer], name: str, start: float, duration_s: float, **attrs):
+    """Add a span measured outside of a `with span(...)` block (e.g. work done before tracing was known to be on)."""
+    if tracer is not None:
+        tracer.spans.append({"name": name, **attrs, "start": start, "duration_s": duration_s,
+                             "thread": threading.current_thread().name})
+
+def breakdown(spans: List[Dict]) -> List[Dict]:
+    """Total/count/max wall time per span name, slowest first."""
+    agg: Dict[str, Dict] = {}
+    for s in spans:
+        a = agg.setdefault(s["name"], {"name": s["name"], "count": 0, "total_s": 0.0, "max_s": 0.0})
+        a["count"] += 1
+        a["total_s"] += s["duration_s"]
+        a["max_s"] = max(a["max_s"], s["duration_s"])
+    return sorted(agg.values(), key=lambda a: a["total_s"], reverse=True)
+
+def to_json(spans: List[Dict]) -> str:
+    """Spans (start offsets relative to the earliest span, in ms) plus the per-name breakdown."""
+    t0 = min((s["start"] for s in spans), default=0.0)
+    out = [{**{k: v for k, v in s.items() if k not in ("start", "duration_s")},
+            "start_ms": round((s["start"] - t0) * 1e3, 3), "duration_ms": round(s["duration_s"] * 1e3, 3)}
+           for s in sorted(spans, key=lambda s: s["start"])]
+    return json.dumps({"spans": out, "breakdown": breakdown(spans)}, indent=2, default=str)
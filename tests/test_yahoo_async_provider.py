@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from echo.data_providers.yahoo_async_provider import AsyncYahooProvider
+
+# Canned /v8/finance/chart payloads served from a local aiohttp server; AsyncYahooProvider points at it via base_url.
+
+CHART = {"chart": {"result": [{
+    "meta": {"regularMarketPrice": 101.5, "chartPreviousClose": 99.0, "currency": "USD",
+             "exchangeTimezoneName": "America/New_York"},
+    "timestamp": [1760621400, 1760707800, 1760794200],
+    "indicators": {"quote": [{"open": [98.0, 99.5, None], "high": [100.0, 102.0, None], "low": [97.5, 99.0, None],
+                              "close": [99.0, 101.5, None], "volume": [1000, 1200, None]}],
+                   "adjclose": [{"adjclose": [98.8, 101.3, None]}]},
+}], "error": None}}
+
+async def _chart(request):
+    ticker = request.match_info["ticker"]
+    if ticker == "BOOM":
+        return web.Response(status=500)
+    if ticker == "NOPE":
+        return web.json_response({"chart": {"result": None, "error": {"code": "Not Found"}}})
+    return web.json_response(CHART)
+
+def _run(test):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/v8/finance/chart/{ticker}", _chart)
+        async with TestServer(app) as server:
+            async with AsyncYahooProvider(base_url=str(server.make_url(""))) as provider:
+                await test(provider)
+    asyncio.run(main())
+
+def test_quote_parses_meta():
+    async def test(provider):
+        q = await provider.quote("AAPL")
+        assert q == {"ticker": "AAPL", "price": 101.5, "prev_close": 99.0, "currency": "USD"}
+    _run(test)
+
+def test_history_parses_bars_in_exchange_tz():
+    async def test(provider):
+        df = await provider.history("AAPL", period="5d", interval="1d")
+        assert list(df.columns) == ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+        assert len(df) == 2  # the bar without a close is dropped
+        assert str(df.index.tz) == "America/New_York"
+        assert df["Close"].tolist() == [99.0, 101.5]
+        assert df["Adj Close"].iloc[-1] == 101.3
+    _run(test)
+
+def test_errors_raise_and_history_many_degrades():
+    async def test(provider):
+        with pytest.raises(RuntimeError, match="Yahoo chart error"):
+            await provider.history("NOPE")
+        with pytest.raises(aiohttp.ClientResponseError):
+            await provider.quote("BOOM")
+        frames = await provider.history_many(["AAPL", "BOOM", "NOPE"])
+        assert len(frames["AAPL"]) == 2
+        assert frames["BOOM"].empty and frames["NOPE"].empty
+    _run(test)